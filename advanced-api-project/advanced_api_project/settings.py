@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -75,10 +76,14 @@ WSGI_APPLICATION = 'advanced_api_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Keep one connection per worker for DB_CONN_MAX_AGE seconds instead of
+# reconnecting on every request; health-checked before each reuse.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -139,4 +144,41 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
-}
\ No newline at end of file
+    # Lists are paginated; totals are optional (see api/pagination.py)
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.OptionalCountLimitOffsetPagination",
+}
+
+# Pagination (api/pagination.py)
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "50"))
+API_PAGINATION_COUNT = os.getenv("API_PAGINATION_COUNT", "estimate")  # exact | estimate | none
+API_COUNT_CAP = int(os.getenv("API_COUNT_CAP", "1000"))
+
+# Search on SQLite (api/search.py)
+API_SEARCH_MAX_CANDIDATES = int(os.getenv("API_SEARCH_MAX_CANDIDATES", "5000"))
+API_SEARCH_MAX_RESULTS = int(os.getenv("API_SEARCH_MAX_RESULTS", "1000"))
+
+# Cache
+# Local memory per process by default; set REDIS_URL to share the cache
+# (and its invalidations) between workers.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "advanced-api-project",
+    }
+}
+if os.getenv("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+    }
+
+# Anonymous response cache for GET /api/books/ (api/cache.py)
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+
+# Books nested in each author of /api/v1/authors/ (newest first); the full
+# list is paginated under /api/v1/authors/<id>/books/
+AUTHOR_NESTED_BOOKS = int(os.getenv("AUTHOR_NESTED_BOOKS", "5"))
+
+# Max books per request on /api/books/bulk/
+API_BULK_MAX_ITEMS = int(os.getenv("API_BULK_MAX_ITEMS", "1000"))
@@ -17,15 +17,10 @@ Including another URLconf
 # advanced_api_project/urls.py
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from api.views import AuthorViewSet, BookViewSet
-
-router = DefaultRouter()
-router.register(r"authors", AuthorViewSet, basename="author")
-router.register(r"books", BookViewSet, basename="book")
 
+# The ViewSets are mounted by api/urls.py under /api/v1/...; registering the
+# router here as well would shadow the generic /api/books/ endpoints.
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/", include(router.urls)),
     path("api/", include("api.urls")),
 ]
@@ -0,0 +1,198 @@
+"""
+Response cache for anonymous read endpoints.
+
+This module is shared verbatim by advanced-api-project (api/cache.py),
+django_blog (blog/cache.py) and social_media_api (posts/cache.py); the
+projects are deployed separately, so each carries a copy. Keep the copies
+identical (api/test_cache.py checks) and put project-specific helpers in
+their own modules.
+
+Cached entries are keyed on (namespace, generation, path + query string,
+Accept header, auth state). Only anonymous GET/HEAD requests are served
+from or stored into the cache; authenticated traffic always hits the view,
+since its pages carry per-user bits.
+
+Invalidation is event-driven: each app's signal handlers bump the
+generation of a namespace whenever the underlying models change, so every
+key built for the old generation simply stops being looked up and ages out
+through its TTL. Inside a transaction the bump is repeated once it commits:
+a concurrent reader may have re-cached the pre-commit rows under the new
+generation in between.
+
+The backend is whatever cache alias RESPONSE_CACHE_ALIAS points at
+(local memory by default, Redis when REDIS_URL is set in settings).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+KEY_PREFIX = "respcache"
+SAFE_METHODS = ("GET", "HEAD")
+
+
+def get_cache():
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def default_ttl() -> int:
+    return getattr(settings, "RESPONSE_CACHE_TTL", 60)
+
+
+def _incr(key: str, initial: int = 1) -> int:
+    """Atomic-ish counter: incr when present, otherwise seed it."""
+    cache = get_cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, initial, timeout=None):
+            return initial
+        return cache.incr(key)
+
+
+# ---------------------------------------------------------------------
+# Generations (invalidation)
+# ---------------------------------------------------------------------
+def _generation_key(namespace: str) -> str:
+    return f"{KEY_PREFIX}:gen:{namespace}"
+
+
+def get_generation(namespace: str) -> int:
+    cache = get_cache()
+    generation = cache.get(_generation_key(namespace))
+    if generation is None:
+        cache.add(_generation_key(namespace), 1, timeout=None)
+        generation = cache.get(_generation_key(namespace), 1)
+    return generation
+
+
+def invalidate(*namespaces: str) -> None:
+    """Drop every cached response of the given namespaces."""
+    now_and_on_commit(lambda: _bump(namespaces))
+
+
+def _bump(namespaces) -> None:
+    for namespace in namespaces:
+        _incr(_generation_key(namespace), initial=2)
+
+
+def now_and_on_commit(func, using=None) -> None:
+    """
+    Run func() now, and again after the current transaction commits (if
+    any): caches must drop data written by the transaction as soon as it
+    is written, and whatever was cached from the old rows until it commits.
+    """
+    func()
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(func, using=using)
+
+
+# ---------------------------------------------------------------------
+# Hit / miss counters
+# ---------------------------------------------------------------------
+def _stat_key(namespace: str, outcome: str) -> str:
+    return f"{KEY_PREFIX}:stats:{namespace}:{outcome}"
+
+
+def record(namespace: str, outcome: str) -> None:
+    _incr(_stat_key(namespace, outcome))
+
+
+def stats(*namespaces: str) -> dict:
+    """Return {"<namespace>": {"hits": n, "misses": n}} for the given namespaces."""
+    cache = get_cache()
+    keys = {
+        (ns, outcome): _stat_key(ns, outcome)
+        for ns in namespaces for outcome in ("hit", "miss")
+    }
+    values = cache.get_many(keys.values())
+    return {
+        ns: {
+            "hits": values.get(keys[(ns, "hit")], 0),
+            "misses": values.get(keys[(ns, "miss")], 0),
+        }
+        for ns in namespaces
+    }
+
+
+# ---------------------------------------------------------------------
+# Keys
+# ---------------------------------------------------------------------
+def is_anonymous(request) -> bool:
+    # Token clients are resolved by DRF later in dispatch, so treat any
+    # Authorization header as "authenticated" up front.
+    if request.META.get("HTTP_AUTHORIZATION"):
+        return False
+    user = getattr(request, "user", None)
+    return not (user and user.is_authenticated)
+
+
+def build_key(namespace: str, request) -> str:
+    auth_state = "anon" if is_anonymous(request) else "auth"
+    raw = "|".join([
+        request.path,
+        "&".join(sorted(request.GET.urlencode().split("&"))),
+        request.META.get("HTTP_ACCEPT", ""),
+    ])
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return f"{KEY_PREFIX}:{namespace}:{get_generation(namespace)}:{auth_state}:{digest}"
+
+
+def memoize(namespace: str, request, compute, ttl=None):
+    """
+    compute() once per (namespace generation, query string), for anonymous
+    and authenticated clients alike; for data that does not depend on who asks.
+    """
+    raw = "&".join(sorted(request.GET.urlencode().split("&")))
+    digest = hashlib.md5(f"{request.path}|{raw}".encode("utf-8")).hexdigest()
+    key = f"{KEY_PREFIX}:{namespace}:{get_generation(namespace)}:data:{digest}"
+    cache = get_cache()
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, default_ttl() if ttl is None else ttl)
+    return value
+
+
+# ---------------------------------------------------------------------
+# View mixin
+# ---------------------------------------------------------------------
+class AnonymousResponseCacheMixin:
+    """
+    Serve anonymous GET/HEAD requests from the response cache.
+
+    Set `cache_namespace` (shared with the invalidation signals) and,
+    optionally, `cache_ttl` on the view. Override get_cache_namespace() for
+    finer-grained namespaces, e.g. one per object.
+    """
+    cache_namespace = None
+    cache_ttl = None
+
+    def get_cache_namespace(self):
+        return self.cache_namespace or self.__class__.__name__.lower()
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS or not is_anonymous(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        namespace = self.get_cache_namespace()
+        key = build_key(namespace, request)
+        cache = get_cache()
+
+        cached = cache.get(key)
+        if cached is not None:
+            record(namespace, "hit")
+            cached["X-Cache"] = "HIT"
+            return cached
+
+        record(namespace, "miss")
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            response["X-Cache"] = "MISS"
+            ttl = self.cache_ttl if self.cache_ttl is not None else default_ttl()
+            if hasattr(response, "render") and callable(response.render):
+                response.add_post_render_callback(lambda r: cache.set(key, r, ttl))
+            else:
+                cache.set(key, response, ttl)
+        return response
@@ -0,0 +1,74 @@
+# api/filters.py
+"""
+Filtering machinery built once per view class instead of per request.
+
+On every request DRF instantiates each of a view's filter_backends, and
+DjangoFilterBackend turns `filterset_fields` into a new FilterSet class
+(model introspection and metaclass work), whose instance then builds a new
+form class. On small filtered queries that overhead dominates. Here:
+
+- CachedFilterBackendsMixin (views): one instance of each filter backend
+  per view class, so backends must not keep per-request state.
+- CachedDjangoFilterBackend: one FilterSet class per (view class, model).
+- CachedFormFilterSet: one form class per FilterSet class; Django deep-
+  copies form fields per form instance, so sharing them is safe as long as
+  no filter builds its field from the request.
+
+API_VIEW_METADATA_CACHE = False switches all of it (and the serializer
+field prototypes, api/serializers.py) off; manage.py bench_view_overhead
+compares both.
+"""
+from django.conf import settings
+from django_filters.rest_framework import DjangoFilterBackend, FilterSet
+
+
+def view_metadata_cache_enabled() -> bool:
+    """Reuse per-class filter/serializer machinery (here and api/serializers.py)."""
+    return getattr(settings, "API_VIEW_METADATA_CACHE", True)
+
+
+class CachedFormFilterSet(FilterSet):
+    def get_form_class(self):
+        if not view_metadata_cache_enabled():
+            return super().get_form_class()
+        cls = type(self)
+        form_class = cls.__dict__.get("_cached_form_class")
+        if form_class is None:
+            form_class = super().get_form_class()
+            cls._cached_form_class = form_class
+        return form_class
+
+
+class CachedDjangoFilterBackend(DjangoFilterBackend):
+    filterset_base = CachedFormFilterSet
+    filterset_classes = {}
+
+    def get_filterset_class(self, view, queryset=None):
+        if not view_metadata_cache_enabled():
+            return super().get_filterset_class(view, queryset)
+        key = (type(view), queryset.model if queryset is not None else None)
+        try:
+            return self.filterset_classes[key]
+        except KeyError:
+            filterset_class = super().get_filterset_class(view, queryset)
+            self.filterset_classes[key] = filterset_class
+            return filterset_class
+
+
+class CachedFilterBackendsMixin:
+    """GenericAPIView.filter_queryset() with the backends instantiated once per view class."""
+
+    @classmethod
+    def get_filter_backend_instances(cls):
+        backends = cls.__dict__.get("_filter_backend_instances")
+        if backends is None:
+            backends = [backend() for backend in cls.filter_backends]
+            cls._filter_backend_instances = backends
+        return backends
+
+    def filter_queryset(self, queryset):
+        if not view_metadata_cache_enabled():
+            return super().filter_queryset(queryset)
+        for backend in self.get_filter_backend_instances():
+            queryset = backend.filter_queryset(self.request, queryset, self)
+        return queryset
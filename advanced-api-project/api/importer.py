@@ -0,0 +1,193 @@
+# api/importer.py
+"""
+Streaming catalog import: upsert Authors and Books by natural key.
+
+Input is CSV (header: title,publication_year,author) or NDJSON (one
+{"title", "publication_year", "author"} object per line), where `author`
+is the author's name. Used by `manage.py import_catalog` and
+POST /api/books/import/.
+
+- Authors are matched by normalized name (whitespace collapsed, casefolded)
+  through an in-memory {name: pk} map, loaded once; unknown ones are
+  created per batch with one bulk_create.
+- Books are upserted on (author, title), the api_book_author_title_uniq
+  constraint, with bulk_create(update_conflicts=True): an existing book gets
+  the row's publication_year.
+- Rows are read lazily and written in batches of `batch_size`, each in its
+  own transaction, so memory stays constant in the file size (the author
+  map grows with the number of distinct authors only). A failing batch
+  rolls back by itself; the ones before it stay imported.
+- Invalid rows are skipped and counted; the first MAX_REPORTED_ERRORS are
+  reported with their line number.
+"""
+import csv
+import datetime
+import json
+import time
+
+from django.db import transaction
+
+from .models import Author, Book
+from .signals import bulk_changes
+
+FORMATS = ("csv", "ndjson")
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/x-jsonlines": "ndjson",
+}
+DEFAULT_BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 20
+
+TITLE_MAX = Book._meta.get_field("title").max_length
+NAME_MAX = Author._meta.get_field("name").max_length
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def format_for(name: str):
+    """'csv' / 'ndjson' from a file name or a content type, else None."""
+    name = (name or "").split(";")[0].strip().lower()
+    if name in CONTENT_TYPES:
+        return CONTENT_TYPES[name]
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+def read_rows(lines, fmt):
+    """Yield (line number, row) from an iterable of text lines; row is None if unreadable."""
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError:
+            yield number, None
+
+
+def clean_row(row):
+    """(title, publication_year, author name), or raise ValueError with the reason."""
+    if not isinstance(row, dict):
+        raise ValueError("Unreadable row.")
+    title = str(row.get("title") or "").strip()
+    author = " ".join(str(row.get("author") or "").split())
+    if not title or len(title) > TITLE_MAX:
+        raise ValueError(f"title must be 1-{TITLE_MAX} characters.")
+    if not author or len(author) > NAME_MAX:
+        raise ValueError(f"author must be 1-{NAME_MAX} characters.")
+    try:
+        year = int(row.get("publication_year"))
+    except (TypeError, ValueError):
+        raise ValueError("publication_year must be an integer.") from None
+    if not 0 < year <= datetime.date.today().year:
+        raise ValueError("publication_year must be positive and not in the future.")
+    return title, year, author
+
+
+class ImportStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows = 0
+        self.upserted = 0
+        self.authors_created = 0
+        self.skipped = 0
+        self.errors = []
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def skip(self, line, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "upserted": self.upserted,
+            "authors_created": self.authors_created,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+class CatalogImporter:
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+        self.batch_size = batch_size
+        self.progress = progress
+        self.authors = None
+        self.stats = ImportStats()
+
+    def load_authors(self):
+        self.authors = {}
+        for pk, name in Author.objects.order_by("pk").values_list("pk", "name").iterator(chunk_size=10_000):
+            self.authors.setdefault(normalize_name(name), pk)
+
+    def run(self, lines, fmt):
+        if self.authors is None:
+            self.load_authors()
+        batch = []
+        for line, row in read_rows(lines, fmt):
+            self.stats.rows += 1
+            try:
+                batch.append(clean_row(row))
+            except ValueError as exc:
+                self.stats.skip(line, str(exc))
+            if len(batch) >= self.batch_size:
+                self.write(batch)
+                batch = []
+        if batch:
+            self.write(batch)
+        return self.stats
+
+    def write(self, batch):
+        with bulk_changes(), transaction.atomic():
+            self.create_authors(author for _, _, author in batch)
+            # One row per natural key (the last wins): PostgreSQL refuses to
+            # update the same row twice in one INSERT ... ON CONFLICT
+            books = {}
+            for title, year, author in batch:
+                author_id = self.authors[normalize_name(author)]
+                books[author_id, title] = Book(title=title, publication_year=year, author_id=author_id)
+            Book.objects.bulk_create(
+                books.values(),
+                update_conflicts=True,
+                unique_fields=["author", "title"],
+                update_fields=["publication_year"],
+            )
+        self.stats.upserted += len(books)
+        if self.progress:
+            self.progress(self.stats)
+
+    def create_authors(self, names):
+        new = {}
+        for name in names:
+            key = normalize_name(name)
+            if key not in self.authors:
+                new.setdefault(key, Author(name=name))
+        if not new:
+            return
+        created = Author.objects.bulk_create(new.values())
+        if any(author.pk is None for author in created):  # no RETURNING (e.g. MySQL)
+            created = Author.objects.filter(name__in=[a.name for a in created]).order_by("pk")
+        for author in created:
+            self.authors.setdefault(normalize_name(author.name), author.pk)
+        self.stats.authors_created += len(new)
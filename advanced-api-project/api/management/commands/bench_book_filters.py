@@ -0,0 +1,133 @@
+"""
+Time the Book list filters with and without the filter indexes.
+
+    python manage.py bench_book_filters --books 1000000 --keepdb
+
+Builds a throwaway test database (migrated, so with every index), fills it
+with a synthetic catalogue, then runs the queries BookListView/BookViewSet
+issue for their filterset_fields and default ordering. Each query runs
+--repeat times with the indexes (after) and again once they are dropped
+(before); p50/p95 are reported side by side. --keepdb reuses the database
+and its fixture between runs, as they take a while to build (on SQLite,
+only with a file-backed DATABASES["default"]["TEST"]["NAME"]).
+"""
+import importlib
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from api.models import Author, Book
+
+WORDS = (
+    "the a of night day war peace house river garden shadow light city "
+    "dream winter summer stone glass iron silver golden last first lost "
+    "secret empire island mountain storm fire ocean star world machine"
+).split()
+
+
+def queries():
+    """(label, queryset factory) pairs mirroring the Book list filters."""
+    return [
+        ("year range, default order", lambda: Book.objects.filter(
+            publication_year__gte=1990, publication_year__lte=1992).order_by("publication_year", "title")[:50]),
+        ("default order, offset 5000", lambda: Book.objects.order_by("publication_year", "title")[5000:5050]),
+        ("title exact", lambda: Book.objects.filter(title="the golden river 17")[:50]),
+        ("title iexact", lambda: Book.objects.filter(title__iexact="The Golden River 17")[:50]),
+        ("title istartswith", lambda: Book.objects.filter(title__istartswith="Golden Riv")[:50]),
+        ("author__name iexact", lambda: Book.objects.filter(author__name__iexact="AUTHOR 0042")[:50]),
+        ("author id", lambda: Book.objects.filter(author_id=42)[:50]),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Benchmark Book filter queries before/after the filter indexes on a large fixture."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=1_000_000)
+        parser.add_argument("--authors", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--keepdb", action="store_true", help="Keep and reuse the benchmark database.")
+
+    def handle(self, *args, **options):
+        creation = connection.creation
+        old_name = connection.settings_dict["NAME"]
+        creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options["keepdb"])
+        try:
+            self._fill(options["books"], options["authors"])
+            after = self._time_all(options["repeat"])
+            dropped = self._drop_indexes()
+            before = self._time_all(options["repeat"])
+            self._restore_indexes(dropped)
+        finally:
+            creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+
+        self.stdout.write(f"{Book._meta.db_table}: {options['books']} rows, "
+                          f"{options['repeat']} runs per query (ms)")
+        self.stdout.write(f"{'query':<28}{'before p50':>12}{'before p95':>12}{'after p50':>12}{'after p95':>12}")
+        for label, _ in queries():
+            b, a = before[label], after[label]
+            self.stdout.write(f"{label:<28}{b[1]:>12.3f}{b[2]:>12.3f}{a[1]:>12.3f}{a[2]:>12.3f}")
+
+    # -----------------------------------------------------------------
+    def _fill(self, books, authors):
+        if Book.objects.count() == books:
+            return
+        Book.objects.all().delete()
+        Author.objects.all().delete()
+        rng = random.Random(42)
+        Author.objects.bulk_create(
+            [Author(id=i, name=f"Author {i:04d}") for i in range(1, authors + 1)], batch_size=5000
+        )
+        batch = []
+        for i in range(books):
+            title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.choice(WORDS)} {i}"  # (author, title) is unique
+            batch.append(Book(
+                title=title,
+                publication_year=rng.randint(1900, 2024),
+                author_id=rng.randint(1, authors),
+            ))
+            if len(batch) == 10_000:
+                Book.objects.bulk_create(batch)
+                batch = []
+                if (i + 1) % 100_000 == 0:
+                    self.stderr.write(f"  fixture: {i + 1}/{books} books")
+        Book.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def _time_all(self, repeat):
+        results = {}
+        for label, build in queries():
+            list(build())  # warm the page cache
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(build())
+                timings.append((time.perf_counter() - start) * 1000)
+            percentiles = statistics.quantiles(timings, n=100) if repeat > 1 else timings * 99
+            results[label] = (statistics.mean(timings), percentiles[49], percentiles[94])
+        return results
+
+    # -----------------------------------------------------------------
+    @staticmethod
+    def _index_models():
+        return [Author, Book]
+
+    def _drop_indexes(self):
+        prefix = importlib.import_module("api.migrations.0003_prefix_search_indexes")
+        with connection.schema_editor() as editor:
+            for model in self._index_models():
+                for index in model._meta.indexes:
+                    editor.remove_index(model, index)
+            prefix.drop_prefix_indexes(None, editor)
+        return prefix
+
+    def _restore_indexes(self, prefix):
+        with connection.schema_editor() as editor:
+            for model in self._index_models():
+                for index in model._meta.indexes:
+                    editor.add_index(model, index)
+            prefix.create_prefix_indexes(None, editor)
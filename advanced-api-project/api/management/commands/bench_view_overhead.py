@@ -0,0 +1,99 @@
+"""
+Time the per-request framework overhead of the Book list views.
+
+    python manage.py bench_view_overhead --requests 2000
+
+Builds a throwaway test database with a small catalogue, then sends the
+same tiny filtered request (a one-row page) to BookListView and BookViewSet
+through the full DRF stack, with API_VIEW_METADATA_CACHE off (before:
+filterset class, filter backends and serializer fields rebuilt per request)
+and on (after, see api/filters.py). The bare ORM query is timed too, so the
+rest of each request is the framework's share. Times are per request, in
+microseconds.
+"""
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.models import Author, Book
+from api.views import BookListView, BookViewSet
+
+PARAMS = {"publication_year": 1945, "author__name__iexact": "Author 007", "limit": 1, "count": "none"}
+
+
+class Command(BaseCommand):
+    help = "Benchmark the per-request overhead of BookListView/BookViewSet with and without metadata caching."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--books", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        creation = connection.creation
+        creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self._fill(options["books"])
+            user = get_user_model().objects.create_user(username="bench", password="bench")
+            views = [
+                ("BookListView", BookListView.as_view()),
+                ("BookViewSet list", BookViewSet.as_view({"get": "list"})),
+            ]
+            rows = [("bare query", *[self._time_query(options["requests"])] * 2)]
+            for label, view in views:
+                with override_settings(API_VIEW_METADATA_CACHE=False):
+                    before = self._time_view(view, user, options["requests"])
+                with override_settings(API_VIEW_METADATA_CACHE=True):
+                    after = self._time_view(view, user, options["requests"])
+                rows.append((label, before, after))
+        finally:
+            creation.destroy_test_db(connection.settings_dict["NAME"], verbosity=0)
+
+        self.stdout.write(f"{options['requests']} requests each, microseconds per request")
+        self.stdout.write(f"{'':<20}{'before p50':>12}{'before mean':>13}{'after p50':>12}{'after mean':>12}")
+        for label, before, after in rows:
+            self.stdout.write(f"{label:<20}{before[0]:>12.0f}{before[1]:>13.0f}{after[0]:>12.0f}{after[1]:>12.0f}")
+
+    # -----------------------------------------------------------------
+    def _fill(self, books):
+        authors = Author.objects.bulk_create([Author(name=f"Author {i:03d}") for i in range(100)])
+        Book.objects.bulk_create([
+            Book(title=f"Book {i:05d}", publication_year=1900 + i % 100, author=authors[i % 100])
+            for i in range(books)
+        ])
+
+    def _summary(self, timings):
+        timings = [t * 1_000_000 for t in timings]
+        return statistics.median(timings), statistics.fmean(timings)
+
+    def _time_query(self, n):
+        timings = []
+        for _ in range(n):
+            start = time.perf_counter()
+            list(Book.objects.filter(publication_year=PARAMS["publication_year"],
+                                     author__name__iexact=PARAMS["author__name__iexact"])[:2])
+            timings.append(time.perf_counter() - start)
+        return self._summary(timings)
+
+    def _time_view(self, view, user, n):
+        factory = APIRequestFactory()
+        for _ in range(20):  # warm up
+            self._call(view, factory, user)
+        timings = []
+        for _ in range(n):
+            start = time.perf_counter()
+            self._call(view, factory, user)
+            timings.append(time.perf_counter() - start)
+        return self._summary(timings)
+
+    def _call(self, view, factory, user):
+        request = factory.get("/api/books/", PARAMS)
+        request.user = user  # authenticated: skip the anonymous response cache
+        force_authenticate(request, user)
+        response = view(request)
+        response.render()
+        assert response.status_code == 200, response.data
@@ -0,0 +1,50 @@
+"""
+Upsert Authors and Books from a CSV or NDJSON catalog (see api/importer.py).
+
+    python manage.py import_catalog catalog.csv
+    zcat catalog.ndjson.gz | python manage.py import_catalog - --format ndjson
+
+Progress (rows, rows/s) goes to stderr after every batch; the summary and
+the first skipped rows to stdout.
+"""
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.importer import DEFAULT_BATCH_SIZE, FORMATS, CatalogImporter, format_for
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV/NDJSON catalog into Author/Book, upserting on (author, title)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Catalog file, or - for stdin.")
+        parser.add_argument("--format", choices=FORMATS, help="Default: from the file extension.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or format_for(path)
+        if fmt is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format.")
+
+        importer = CatalogImporter(batch_size=options["batch_size"], progress=self.report)
+        if path == "-":
+            stats = importer.run(sys.stdin, fmt)
+        else:
+            try:
+                with open(path, encoding="utf-8-sig", newline="") as lines:
+                    stats = importer.run(lines, fmt)
+            except OSError as exc:
+                raise CommandError(exc)
+
+        self.stdout.write(
+            f"{stats.rows} rows in {stats.elapsed:.1f}s ({stats.rows_per_second:,.0f} rows/s): "
+            f"{stats.upserted} books upserted, {stats.authors_created} authors created, "
+            f"{stats.skipped} rows skipped"
+        )
+        for error in stats.errors:
+            self.stdout.write(f"  line {error['line']}: {error['error']}")
+
+    def report(self, stats):
+        self.stderr.write(f"  {stats.rows:,} rows  {stats.rows_per_second:,.0f} rows/s")
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:10
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='api_author_name_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['publication_year', 'title'], name='api_book_year_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(django.db.models.functions.text.Upper('title'), name='api_book_title_upper_idx'),
+        ),
+    ]
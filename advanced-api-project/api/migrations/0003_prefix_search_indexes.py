@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:12
+
+from django.db import migrations
+
+# Indexes the ORM can't declare portably, per database vendor.
+#
+# PostgreSQL: istartswith is UPPER(title::text) LIKE UPPER('x%'); outside the
+#   C locale only a *_pattern_ops index can serve LIKE prefixes.
+# SQLite: LIKE is case-insensitive and only uses an index declared
+#   COLLATE NOCASE; iexact on author names is a LIKE as well.
+PREFIX_INDEXES = {
+    "postgresql": [
+        ("api_book_title_prefix_idx", "CREATE INDEX IF NOT EXISTS api_book_title_prefix_idx "
+                                      "ON api_book (UPPER(title) varchar_pattern_ops)"),
+        ("api_author_name_prefix_idx", "CREATE INDEX IF NOT EXISTS api_author_name_prefix_idx "
+                                       "ON api_author (UPPER(name) varchar_pattern_ops)"),
+    ],
+    "sqlite": [
+        ("api_book_title_nocase_idx", "CREATE INDEX IF NOT EXISTS api_book_title_nocase_idx "
+                                      "ON api_book (title COLLATE NOCASE)"),
+        ("api_author_name_nocase_idx", "CREATE INDEX IF NOT EXISTS api_author_name_nocase_idx "
+                                       "ON api_author (name COLLATE NOCASE)"),
+    ],
+}
+
+
+def create_prefix_indexes(apps, schema_editor):
+    for _, sql in PREFIX_INDEXES.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    for name, _ in PREFIX_INDEXES.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_book_author_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:40
+
+from django.db import migrations
+
+# GIN trigram indexes for ?search= (api/search.py). icontains compiles to
+# UPPER(col::text) LIKE UPPER('%term%'), which no btree can serve; a
+# gin_trgm_ops index on the same expression can. PostgreSQL only: SQLite
+# searches through the in-process trigram index instead.
+TRIGRAM_INDEXES = [
+    ("api_book_title_trgm_idx", "CREATE INDEX IF NOT EXISTS api_book_title_trgm_idx "
+                                "ON api_book USING GIN (UPPER(title) gin_trgm_ops)"),
+    ("api_author_name_trgm_idx", "CREATE INDEX IF NOT EXISTS api_author_name_trgm_idx "
+                                 "ON api_author USING GIN (UPPER(name) gin_trgm_ops)"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for _, sql in TRIGRAM_INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_prefix_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
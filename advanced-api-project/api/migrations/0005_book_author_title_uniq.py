@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:05
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# Conflicting (author, title) pairs listed when the migration refuses to run
+MAX_LISTED = 20
+
+
+def check_no_duplicate_books(apps, schema_editor):
+    """
+    Refuse to add the (author, title) constraint over duplicate books.
+
+    Which copy to keep is a catalog decision, not a schema one: list the
+    conflicting pairs so they can be merged or renamed, then migrate again.
+    """
+    Book = apps.get_model("api", "Book")
+    duplicates = list(
+        Book.objects.values("author_id", "title")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .order_by("author_id", "title")
+    )
+    if not duplicates:
+        return
+    lines = [
+        f"  author_id={row['author_id']} title={row['title']!r}: ids "
+        + ", ".join(str(pk) for pk in Book.objects.filter(
+            author_id=row["author_id"], title=row["title"]).order_by("pk").values_list("pk", flat=True))
+        for row in duplicates[:MAX_LISTED]
+    ]
+    if len(duplicates) > MAX_LISTED:
+        lines.append(f"  ... and {len(duplicates) - MAX_LISTED} more")
+    raise RuntimeError(
+        f"Cannot add api_book_author_title_uniq: {len(duplicates)} (author, title) pairs "
+        "have more than one book. Merge or rename them, then run migrate again.\n" + "\n".join(lines)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_no_duplicate_books, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='book',
+            constraint=models.UniqueConstraint(fields=('author', 'title'), name='api_book_author_title_uniq'),
+        ),
+    ]
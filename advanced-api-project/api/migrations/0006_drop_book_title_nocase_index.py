@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:40
+
+from django.db import migrations
+
+# SQLite never picked api_book_title_nocase_idx (migration 0003): book
+# lists are always ordered by (publication_year, title), and the planner
+# scans api_book_year_title_idx in that order rather than sort the rows a
+# title prefix search finds. EXPLAIN QUERY PLAN for title__istartswith:
+#   SCAN api_book USING INDEX api_book_year_title_idx
+# The author name index stays: author lists are ordered by name, and
+#   SEARCH api_author USING COVERING INDEX api_author_name_nocase_idx (name>? AND name<?)
+TITLE_NOCASE_INDEX = "api_book_title_nocase_idx"
+CREATE_TITLE_NOCASE_INDEX = f"CREATE INDEX IF NOT EXISTS {TITLE_NOCASE_INDEX} ON api_book (title COLLATE NOCASE)"
+
+
+def drop_title_nocase_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {TITLE_NOCASE_INDEX}")
+
+
+def create_title_nocase_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(CREATE_TITLE_NOCASE_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_book_author_title_uniq"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_title_nocase_index, create_title_nocase_index),
+    ]
@@ -1,5 +1,6 @@
 # api/models.py
 from django.db import models
+from django.db.models.functions import Upper
 
 class Author(models.Model):
     """
@@ -13,6 +14,11 @@ class Author(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            # author__name__iexact is UPPER(name) = UPPER(%s) on PostgreSQL
+            # (SQLite gets a NOCASE index instead, see migration 0003)
+            models.Index(Upper("name"), name="api_author_name_upper_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -33,6 +39,18 @@ class Book(models.Model):
 
     class Meta:
         ordering = ["publication_year", "title"]
+        indexes = [
+            # default ordering, and publication_year ranges ordered by it
+            models.Index(fields=["publication_year", "title"], name="api_book_year_title_idx"),
+            # title__iexact; prefix search (istartswith) needs the
+            # pattern_ops variant created in migration 0003 (PostgreSQL)
+            models.Index(Upper("title"), name="api_book_title_upper_idx"),
+        ]
+        constraints = [
+            # Natural key for catalog upserts (api/importer.py); its index
+            # also serves author=<id> filters
+            models.UniqueConstraint(fields=["author", "title"], name="api_book_author_title_uniq"),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.publication_year})"
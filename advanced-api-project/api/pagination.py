@@ -0,0 +1,264 @@
+# api/pagination.py
+"""
+Pagination classes for the API.
+
+- OptionalCountLimitOffsetPagination (the REST_FRAMEWORK default):
+  ?limit=<n>&offset=<n>, where the total count is optional.
+  ?count=exact     COUNT(*) over the filtered queryset.
+  ?count=estimate  (default, API_PAGINATION_COUNT) exact up to API_COUNT_CAP
+                   rows, counted with a LIMITed subquery; beyond that the
+                   planner's row estimate on PostgreSQL (EXPLAIN), with
+                   "count_estimated": true. Other backends have no estimate,
+                   so the count is null there (more than API_COUNT_CAP).
+  ?count=none      no count at all.
+  One extra row is fetched to know whether there is a next page, so a
+  page never needs the count.
+
+- BookCursorPagination: ?paginate=cursor, then follow "next"/"previous".
+  Always in (publication_year, title, id) order, whatever ?ordering= says:
+  the cursor holds all three values of the row it stops at and the next
+  page is a keyset filter on them (no OFFSET), so deep pages cost the
+  same as the first one and rows sharing a year and title are neither
+  repeated nor skipped.
+
+- BookPagination: what the Book list endpoints use; cursor pages when
+  asked for (?paginate=cursor or a ?cursor=), limit/offset otherwise.
+
+- BookPagePagination: page-number pages of books, ?page=<n>&page_size=<n>
+  (capped), used by the /api/v1/authors/<id>/books/ sub-resource.
+"""
+import json
+import re
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    Cursor,
+    CursorPagination,
+    LimitOffsetPagination,
+    PageNumberPagination,
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+COUNT_MODES = ("exact", "estimate", "none")
+EXPLAIN_ROWS = re.compile(r"rows=(\d+)")
+
+
+def count_cap() -> int:
+    return getattr(settings, "API_COUNT_CAP", 1000)
+
+
+def planner_estimate(queryset):
+    """Row estimate from PostgreSQL's planner, or None on other backends."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN {sql}", params)
+        match = EXPLAIN_ROWS.search(cursor.fetchone()[0])
+    return int(match.group(1)) if match else None
+
+
+def estimate_count(queryset):
+    """
+    (count, estimated): exact below the cap, the planner's estimate above
+    it, or (None, False) when the backend has none.
+    """
+    cap = count_cap()
+    counted = queryset.order_by()[:cap + 1].count()
+    if counted <= cap:
+        return counted, False
+    estimate = planner_estimate(queryset)
+    if estimate is None:
+        return None, False
+    return max(estimate, cap + 1), True
+
+
+class OptionalCountLimitOffsetPagination(LimitOffsetPagination):
+    default_limit = getattr(settings, "API_PAGE_SIZE", 50)
+    max_limit = 500
+    count_query_param = "count"
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode in COUNT_MODES:
+            return mode
+        return getattr(settings, "API_PAGINATION_COUNT", "estimate")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        rows = rows[:self.limit]
+
+        mode = self.get_count_mode(request)
+        self.count_estimated = False
+        if not self.has_next and (rows or not self.offset):
+            # On the last page the total is known without counting
+            self.count = self.offset + len(rows)
+        elif mode == "none":
+            self.count = None
+        elif mode == "exact":
+            self.count = self.get_count(queryset)
+        else:
+            self.count, self.count_estimated = estimate_count(queryset)
+        self.display_page_controls = False
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("count", self.count),
+            ("count_estimated", self.count_estimated),
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"]["nullable"] = True
+        response_schema["properties"]["count_estimated"] = {"type": "boolean"}
+        return response_schema
+
+
+def keyset_filter(ordering, values, reverse=False):
+    """
+    Rows after `values` in the (ascending, unique) `ordering`, or before
+    them if `reverse`: (a, b, c) > (x, y, z) spelled out as
+    a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z).
+    """
+    lookup = "lt" if reverse else "gt"
+    condition = Q()
+    for i, field in enumerate(ordering):
+        condition |= Q(**dict(zip(ordering[:i], values[:i])), **{f"{field}__{lookup}": values[i]})
+    return condition
+
+
+class BookCursorPagination(CursorPagination):
+    """
+    Keyset pages over a unique ordering. DRF's CursorPagination positions
+    on the first ordering field only and skips ties with an OFFSET; here
+    the position is the whole ordering tuple, so no offset is ever needed.
+    """
+    page_size = getattr(settings, "API_PAGE_SIZE", 50)
+    page_size_query_param = "limit"
+    max_page_size = 500
+    ordering = ("publication_year", "title", "id")
+    position_types = (int, str, int)
+
+    def get_ordering(self, request, queryset, view):
+        # Not the view's ordering filter: the keyset needs a unique ordering
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        self.position = self.cursor.position if self.cursor else None
+
+        queryset = queryset.order_by(*(f"-{field}" for field in self.ordering) if reverse else self.ordering)
+        if self.position is not None:
+            queryset = queryset.filter(keyset_filter(self.ordering, self.position, reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+        self.display_page_controls = self.has_next or self.has_previous
+        return self.page
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message) from None
+        if not (
+            isinstance(position, list)
+            and len(position) == len(self.position_types)
+            and all(type(value) is kind for value, kind in zip(position, self.position_types))
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor._replace(position=position)
+
+    def link(self, row, reverse):
+        # An empty page (the rows were deleted) keeps the position it was asked for
+        position = self._get_position_from_instance(row, self.ordering) if row is not None else self.position
+        return self.encode_cursor(Cursor(offset=0, reverse=reverse, position=json.dumps(position)))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.link(self.page[-1] if self.page else None, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.link(self.page[0] if self.page else None, reverse=True)
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            return [instance[field] for field in ordering]
+        return [getattr(instance, field) for field in ordering]
+
+
+class BookPagination(BasePagination):
+    """Cursor pages on request (?paginate=cursor or ?cursor=), limit/offset otherwise."""
+    mode_query_param = "paginate"
+
+    def __init__(self):
+        self.delegate = None
+
+    @classmethod
+    def wants_cursor(cls, request):
+        return "cursor" in request.query_params or request.query_params.get(cls.mode_query_param) == "cursor"
+
+    def pick(self, request):
+        if self.wants_cursor(request):
+            return BookCursorPagination()
+        return OptionalCountLimitOffsetPagination()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.delegate = self.pick(request)
+        return self.delegate.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.delegate.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return OptionalCountLimitOffsetPagination().get_paginated_response_schema(schema)
+
+    def get_results(self, data):
+        return data["results"]
+
+
+class BookPagePagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -0,0 +1,300 @@
+# api/search.py
+"""
+Relevance-ranked substring search over Book title and author name.
+
+Used for `?search=` (and the legacy `?q=`) by BookListView and BookViewSet
+through BookSearchFilter. Semantics match DRF's SearchFilter: every term
+must occur in the title or the author's name, case-insensitively. What
+changes is how matches are found and ordered:
+
+PostgreSQL  GIN pg_trgm indexes on UPPER(title) / UPPER(author.name)
+            (migration 0004) serve the ILIKE '%term%' filters; results are
+            ranked by trigram word similarity.
+SQLite      an in-process trigram index (term trigrams -> book ids) finds
+            the candidates without scanning the table; the same ranking is
+            computed in Python, and only the API_SEARCH_MAX_RESULTS best
+            matches are returned. Terms the index can't narrow down (one or
+            two letters, or trigrams found in more than
+            API_SEARCH_MAX_CANDIDATES books) are filtered with ICONTAINS.
+            The index follows Book/Author changes by replaying the change
+            log (api/signals.py); a bulk change reloads it.
+
+In both, a title or author name starting with the term ranks first, which
+is what typeahead wants. Unless ?ordering= is given, RankedOrderingFilter
+keeps results in relevance order.
+"""
+import heapq
+import threading
+import uuid
+from collections import defaultdict
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+from . import cache, signals
+from .models import Book
+
+RANK = "search_rank"
+PREFIX_BONUS = 1.0
+EPOCH_KEY = f"{cache.KEY_PREFIX}:search:epoch"
+
+
+def max_candidates() -> int:
+    return getattr(settings, "API_SEARCH_MAX_CANDIDATES", 5000)
+
+
+def max_results() -> int:
+    return getattr(settings, "API_SEARCH_MAX_RESULTS", 1000)
+
+
+def trigrams(text: str) -> set:
+    """pg_trgm-style trigrams: per lower-cased word, padded with two spaces in front, one behind."""
+    grams = set()
+    for word in text.lower().split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(term_grams: set, text_grams: set) -> float:
+    if not term_grams or not text_grams:
+        return 0.0
+    return len(term_grams & text_grams) / len(term_grams | text_grams)
+
+
+def score(needle: str, term_grams: set, text: str, text_grams: set) -> float:
+    """Rank of `text` for the term `needle` (both lower-cased), given their trigrams."""
+    bonus = PREFIX_BONUS if text.startswith(needle) else 0.0
+    return bonus + similarity(term_grams, text_grams)
+
+
+# ---------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------
+class PostgresTrigramBackend:
+    def search(self, queryset, terms):
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(author__name__icontains=term))
+        ranks = []
+        for term in terms:
+            ranks += [
+                TrigramWordSimilarity(term, "title"),
+                TrigramWordSimilarity(term, "author__name"),
+                Case(When(title__istartswith=term, then=Value(PREFIX_BONUS)), default=Value(0.0)),
+                Case(When(author__name__istartswith=term, then=Value(PREFIX_BONUS)), default=Value(0.0)),
+            ]
+        return queryset.annotate(**{RANK: Greatest(*ranks, output_field=FloatField())})
+
+
+class InProcessTrigramIndex:
+    """
+    {trigram: {book ids}} over title and author name, plus the documents
+    themselves (lower-cased, with their trigrams) for verifying and ranking
+    candidates.
+
+    A term too short to have an inner trigram, or whose rarest trigram
+    still matches more than max_candidates() books, is not selective enough
+    to beat the table scan: it is filtered with ICONTAINS in SQL instead,
+    like on backends without an index. When no term is selective the
+    results are not ranked.
+
+    Only the max_results() best ranked books are returned.
+
+    Posting sets are replaced, never mutated, so searches can read them
+    while a change is applied.
+    """
+
+    # Rank buckets: ranks are rounded so the CASE stays small
+    PRECISION = 2
+    # Replay at most this many logged changes; more than that, reload
+    MAX_REPLAY = 500
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stamp_seen = None
+        self.postings = {}
+        self.docs = {}
+
+    def stamp(self):
+        """
+        (epoch, change seq). The epoch is a random token kept next to the
+        change log: if the cache is flushed the log restarts at 0, but the
+        epoch changes with it, so an old index is never reused.
+        """
+        store = cache.get_cache()
+        epoch = store.get(EPOCH_KEY)
+        if epoch is None:
+            store.add(EPOCH_KEY, uuid.uuid4().hex, timeout=None)
+            epoch = store.get(EPOCH_KEY)
+        return epoch, signals.change_seq()
+
+    def ensure_current(self):
+        stamp = self.stamp()
+        if stamp == self.stamp_seen:
+            return
+        with self.lock:
+            if stamp == self.stamp_seen:
+                return
+            changes = None
+            if self.stamp_seen and self.stamp_seen[0] == stamp[0]:
+                seen_seq, seq = self.stamp_seen[1], stamp[1]
+                if 0 < seq - seen_seq <= self.MAX_REPLAY:
+                    changes = signals.changes_between(seen_seq, seq)
+            if changes is None or ("all", None) in changes:
+                self.rebuild()
+            else:
+                self.apply(changes)
+            self.stamp_seen = stamp
+
+    def rebuild(self):
+        postings, docs = defaultdict(set), {}
+        for pk, title, author in Book.objects.values_list("pk", "title", "author__name").iterator():
+            docs[pk] = doc = self.document(title, author)
+            for gram in doc[2] | doc[3]:
+                postings[gram].add(pk)
+        self.postings, self.docs = dict(postings), docs
+
+    def apply(self, changes):
+        book_ids = {pk for kind, pk in changes if kind == "book"}
+        author_ids = {pk for kind, pk in changes if kind == "author"}
+        rows = list(
+            Book.objects.filter(Q(pk__in=book_ids) | Q(author_id__in=author_ids))
+            .values_list("pk", "title", "author__name")
+        )
+        updated = {pk: self.document(title, author) for pk, title, author in rows}
+        for pk in book_ids | set(updated):
+            old = self.docs.pop(pk, None)
+            if old is not None:
+                for gram in old[2] | old[3]:
+                    self.postings[gram] = self.postings[gram] - {pk}
+        for pk, doc in updated.items():
+            for gram in doc[2] | doc[3]:
+                self.postings[gram] = self.postings.get(gram, set()) | {pk}
+            self.docs[pk] = doc
+
+    @staticmethod
+    def document(title, author):
+        author = author or ""
+        return title.lower(), author.lower(), trigrams(title), trigrams(author)
+
+    def candidates(self, term):
+        """Ids of the books that may contain `term`, or None if the index can't narrow it down."""
+        grams = trigrams(term)
+        # Substrings inside a word don't carry the word-boundary padding
+        inner = {g for g in grams if " " not in g}
+        if not inner:  # one or two letters: nothing selective to look up
+            return None
+        sets = sorted((self.postings.get(g, set()) for g in inner), key=len)
+        if len(sets[0]) > max_candidates():
+            return None
+        return set.intersection(*sets)
+
+    def search(self, queryset, terms):
+        self.ensure_current()
+        found, unindexed = None, []
+        for term in terms:
+            pks = self.candidates(term)
+            if pks is None:
+                unindexed.append(term)
+            else:
+                found = pks if found is None else found & pks
+        for term in unindexed:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(author__name__icontains=term))
+        if found is None:
+            return queryset
+
+        ranked = [(term.lower(), trigrams(term)) for term in terms if term not in unindexed]
+        ranks = {}
+        for pk in found:
+            doc = self.docs.get(pk)
+            if doc is None:  # removed while we were looking
+                continue
+            title, author, title_grams, author_grams = doc
+            best = None
+            for needle, grams in ranked:
+                if needle not in title and needle not in author:
+                    break
+                rank = max(score(needle, grams, title, title_grams), score(needle, grams, author, author_grams))
+                best = rank if best is None else max(best, rank)
+            else:
+                ranks[pk] = best
+
+        buckets = defaultdict(list)
+        for pk, rank in heapq.nlargest(max_results(), ranks.items(), key=itemgetter(1)):
+            buckets[round(rank, self.PRECISION)].append(pk)
+        queryset = queryset.filter(pk__in=[pk for pks in buckets.values() for pk in pks])
+        if not buckets:
+            return queryset.annotate(**{RANK: Value(0.0, output_field=FloatField())})
+        return queryset.annotate(**{RANK: Case(
+            *[When(pk__in=pks, then=Value(rank)) for rank, pks in buckets.items()],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )})
+
+
+_sqlite_index = InProcessTrigramIndex()
+
+
+def get_backend():
+    if connection.vendor == "postgresql":
+        return PostgresTrigramBackend()
+    if connection.vendor == "sqlite":
+        return _sqlite_index
+    return None
+
+
+def search_books(queryset, terms):
+    """Filter `queryset` to books matching every term, annotated with search_rank."""
+    backend = get_backend()
+    if backend is None:
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(author__name__icontains=term))
+        return queryset
+    return backend.search(queryset, terms)
+
+
+# ---------------------------------------------------------------------
+# DRF filter backends
+# ---------------------------------------------------------------------
+class BookSearchFilter(SearchFilter):
+    """?search=<terms> (or the legacy ?q=<terms>) over title and author name, ranked."""
+    legacy_param = "q"
+
+    def get_search_terms(self, request):
+        terms = super().get_search_terms(request)
+        if not terms and request.query_params.get(self.legacy_param):
+            params = request.query_params[self.legacy_param].replace("\x00", "")
+            terms = params.replace(",", " ").split()
+        return terms
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return search_books(queryset, terms)
+
+
+class RankedOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that keeps search results in relevance order unless
+    ?ordering= is given. Stateless, so one instance can serve every request
+    (api/filters.py).
+    """
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if params:
+            fields = [param.strip() for param in params.split(",")]
+            ordering = self.remove_invalid_fields(queryset, fields, view, request)
+            if ordering:
+                return ordering
+        ordering = self.get_default_ordering(view)
+        if RANK in queryset.query.annotations:
+            return [f"-{RANK}", *(ordering or [])]
+        return ordering
@@ -2,25 +2,219 @@
 """
 Serializers expose model data to the API layer.
 
-- BookSerializer: serializes Book fields and validates publication_year.
-- AuthorSerializer: includes nested books (BookSerializer many=True, read_only=True).
+- FieldPrototypeMixin: model fields built once per serializer class.
+- SparseFieldsMixin: `fields` / `expand` serializer kwargs, which the views
+  fill from ?fields= and ?expand= on reads.
+- BookSerializer: serializes Book fields and validates publication_year;
+  `author` can be expanded to {"id", "name"}.
+  With many=True it is a BookListSerializer, which the bulk endpoint
+  (/api/books/bulk/) uses to validate and save whole lists at once.
+- AuthorSerializer: includes a bounded list of nested books (the newest N),
+  their total (books_count) and a link to the full, paginated list.
   This leverages the reverse relation Author.books defined by Book.author(related_name='books').
 """
+import copy
 import datetime
+
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator
+
+from .filters import view_metadata_cache_enabled
 from .models import Author, Book
 
 
-class BookSerializer(serializers.ModelSerializer):
+def nested_books_limit() -> int:
+    return getattr(settings, "AUTHOR_NESTED_BOOKS", 5)
+
+
+class FieldPrototypeMixin:
+    """
+    ModelSerializer.get_fields() introspects the model on every
+    instantiation. Build the fields once per serializer class and hand out
+    deep copies of them, as DRF already does for declared fields.
+    """
+
+    def get_fields(self):
+        if not view_metadata_cache_enabled():
+            return super().get_fields()
+        cls = type(self)
+        prototypes = cls.__dict__.get("_field_prototypes")
+        if prototypes is None:
+            prototypes = super().get_fields()
+            cls._field_prototypes = prototypes
+        return copy.deepcopy(prototypes)
+
+
+class SparseFieldsMixin:
+    """
+    Optional serializer kwargs:
+      fields  keep only these fields; an unknown name is a ValidationError
+              (400) that lists the available ones
+      expand  replace these relations with the nested serializers built by
+              `expandable_fields` ({name: factory}); an unknown name is a
+              ValidationError (400) as well
+    For many=True both reach the child serializer, so the field set is
+    built once per list, not per item.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        unknown = [name for name in expand if name not in self.expandable_fields]
+        if unknown:
+            raise serializers.ValidationError({"expand": [
+                f"Unknown expansion(s): {', '.join(sorted(unknown))}. "
+                f"Expandable: {', '.join(self.expandable_fields) or 'none'}."
+            ]})
+        for name in expand:
+            if name in self.expandable_fields and name in self.fields:
+                self.fields[name] = self.expandable_fields[name]()
+        if fields is not None:
+            unknown = [name for name in fields if name not in self.fields]
+            if unknown:
+                raise serializers.ValidationError({"fields": [
+                    f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(self.fields)}."
+                ]})
+            for name in set(self.fields) - set(fields):
+                del self.fields[name]
+
+
+class AuthorSummarySerializer(FieldPrototypeMixin, serializers.ModelSerializer):
+    """An author as embedded by ?expand=author."""
+    class Meta:
+        model = Author
+        fields = ["id", "name"]
+
+
+class AuthorField(serializers.PrimaryKeyRelatedField):
+    """
+    Author by primary key. When the serializer context carries an `authors`
+    map ({pk: Author}, filled by BookListSerializer) it is looked up there
+    instead of with one query per book.
+    """
+
+    def to_internal_value(self, data):
+        authors = self.context.get("authors")
+        if authors is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            author = authors.get(int(data))
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if author is None:
+            self.fail("does_not_exist", pk_value=data)
+        return author
+
+
+class BookListSerializer(serializers.ListSerializer):
+    """
+    BookSerializer(many=True).
+
+    Validation resolves the authors of every item in one query, and checks
+    the (author, title) natural key of the whole list in one more, instead
+    of BookSerializer's per-item UniqueTogetherValidator. For updates, pass
+    `instance` as a {pk: Book} map: each item must carry the "id" of one of
+    those books, at most once per list, and is validated against it.
+    create() and update() write
+    with a single bulk_create / bulk_update.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            ids = set()
+            for item in data:
+                try:
+                    ids.add(int(item["author"]))
+                except (KeyError, TypeError, ValueError):
+                    pass
+            self.context["authors"] = Author.objects.in_bulk(ids) if ids else {}
+        self.child.validators = [
+            v for v in self.child.validators if not isinstance(v, UniqueTogetherValidator)
+        ]
+        self.targets, self.target_ids = [], set()
+        validated = super().to_internal_value(data)
+        self.check_natural_keys(validated)
+        return validated
+
+    def check_natural_keys(self, validated):
+        keys = []
+        for index, attrs in enumerate(validated):
+            if "title" in attrs:
+                attrs["title"] = attrs["title"].strip()
+            book = self.targets[index] if self.targets else None
+            author = attrs["author"].pk if "author" in attrs else book.author_id
+            keys.append((author, attrs.get("title", book.title if book else None)))
+
+        taken = {
+            (author, title): pk
+            for pk, author, title in Book.objects.filter(
+                author_id__in={k[0] for k in keys}, title__in={k[1] for k in keys}
+            ).order_by().values_list("pk", "author_id", "title")
+        }
+        seen, errors = set(), {}
+        for index, key in enumerate(keys):
+            own = self.targets[index].pk if self.targets else None
+            if key in seen or taken.get(key, own) != own:
+                errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [
+                    serializers.ErrorDetail("A book with this author and title already exists.", code="unique")
+                ]}
+            seen.add(key)
+        if errors:
+            if not api_settings.LIST_SERIALIZER_ERRORS_AS_DICT:
+                errors = [errors.get(index, {}) for index in range(len(keys))]
+            raise serializers.ValidationError(errors)
+
+    def run_child_validation(self, data):
+        if isinstance(self.instance, dict):
+            pk = data.get("id") if isinstance(data, dict) else None
+            if pk is None:
+                raise serializers.ValidationError({"id": ["Missing book id."]})
+            if not isinstance(pk, int) or isinstance(pk, bool):  # no "1", no true
+                raise serializers.ValidationError({"id": ["Expected an integer id."]})
+            book = self.instance.get(pk)
+            if book is None:
+                raise serializers.ValidationError({"id": ["Unknown book id."]})
+            if book.pk in self.target_ids:
+                raise serializers.ValidationError({"id": ["This book appears more than once in the list."]})
+            self.child.instance = book
+            self.child.initial_data = data
+            self.targets.append(book)
+            self.target_ids.add(book.pk)
+        return super().run_child_validation(data)
+
+    def create(self, validated_data):
+        return Book.objects.bulk_create([Book(**attrs) for attrs in validated_data])
+
+    def update(self, instance, validated_data):
+        fields = set()
+        for book, attrs in zip(self.targets, validated_data):
+            for name, value in attrs.items():
+                setattr(book, name, value)
+            fields.update(attrs)
+        if fields:
+            Book.objects.bulk_update(self.targets, sorted(fields))
+        return self.targets
+
+
+class BookSerializer(SparseFieldsMixin, FieldPrototypeMixin, serializers.ModelSerializer):
     """
     Serializes all Book fields.
     Adds field-level validation for publication_year:
       - must not be in the future.
       - must be a positive integer.
     """
+    author = AuthorField(queryset=Author.objects.all())
+    expandable_fields = {"author": lambda: AuthorSummarySerializer(read_only=True)}
+
     class Meta:
         model = Book
         fields = ["id", "title", "publication_year", "author"]
+        list_serializer_class = BookListSerializer
 
     def validate_publication_year(self, value: int) -> int:
         current_year = datetime.date.today().year
@@ -31,15 +225,35 @@ class BookSerializer(serializers.ModelSerializer):
         return value
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(SparseFieldsMixin, FieldPrototypeMixin, serializers.ModelSerializer):
     """
-    Serializes an Author with a nested, read-only list of their books.
+    Serializes an Author with a nested, read-only list of their newest books.
 
-    Because Book.author uses related_name='books', DRF can access author.books
-    directly and render each Book using BookSerializer.
+    The list is capped at AUTHOR_NESTED_BOOKS, newest publication_year first;
+    `books_count` gives the total and `books_url` the full, paginated list
+    (/api/v1/authors/<id>/books/).
+
+    AuthorViewSet prefetches the capped lists for a whole page in one query
+    (to_attr="latest_books") and annotates books_count; for an instance
+    without them (e.g. one just created) both fall back to a query.
     """
-    books = BookSerializer(many=True, read_only=True)
+    books = serializers.SerializerMethodField()
+    books_count = serializers.SerializerMethodField()
+    books_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Author
-        fields = ["id", "name", "books"]
+        fields = ["id", "name", "books_count", "books", "books_url"]
+
+    def get_books(self, obj):
+        books = getattr(obj, "latest_books", None)
+        if books is None:
+            books = obj.books.order_by("-publication_year", "-id")[:nested_books_limit()]
+        return BookSerializer(books, many=True, context=self.context).data
+
+    def get_books_count(self, obj):
+        count = getattr(obj, "books_count", None)
+        return obj.books.count() if count is None else count
+
+    def get_books_url(self, obj):
+        return reverse("author-books", args=[obj.pk], request=self.context.get("request"))
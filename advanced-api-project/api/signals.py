@@ -0,0 +1,73 @@
+# api/signals.py
+"""
+Invalidate cached Book responses (see api/cache.py) whenever a Book or
+an Author changes; book payloads are filtered and searched by author name.
+
+bulk_create/bulk_update send no signals, and a bulk delete sends one per
+row: wrap bulk writes in `bulk_changes()`, which mutes the per-row
+handler and invalidates once when the block succeeds.
+
+Every change is also appended to a change log in the same cache: one
+("book" | "author", pk) entry per saved/deleted row, or ("all", None) for
+a bulk change, under consecutive sequence numbers. Other processes replay
+it to keep in-process state current without reloading everything (the
+SQLite search index, api/search.py).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache
+from .models import Author, Book
+
+BOOKS_NS = "books"
+CHANGES_KEY = f"{cache.KEY_PREFIX}:changes:{BOOKS_NS}"
+CHANGE_LOG_TTL = 3600
+
+_in_bulk = ContextVar("books_bulk_changes", default=False)
+
+
+def log_change(kind, pk=None) -> None:
+    # Logged again on commit, like invalidations: a replay that read the
+    # rows before the commit would otherwise keep the old ones
+    cache.now_and_on_commit(lambda: _append(kind, pk))
+
+
+def _append(kind, pk) -> None:
+    seq = cache._incr(CHANGES_KEY)
+    cache.get_cache().set(f"{CHANGES_KEY}:{seq}", (kind, pk), CHANGE_LOG_TTL)
+
+
+def change_seq() -> int:
+    """Sequence number of the last logged change (0 before the first)."""
+    return cache.get_cache().get(CHANGES_KEY, 0)
+
+
+def changes_between(start: int, end: int):
+    """The entries logged after `start` up to `end`, or None if any has expired."""
+    keys = [f"{CHANGES_KEY}:{seq}" for seq in range(start + 1, end + 1)]
+    found = cache.get_cache().get_many(keys)
+    if len(found) < len(keys):
+        return None
+    return [found[key] for key in keys]
+
+
+@contextmanager
+def bulk_changes():
+    token = _in_bulk.set(True)
+    try:
+        yield
+    finally:
+        _in_bulk.reset(token)
+    cache.invalidate(BOOKS_NS)
+    log_change("all")
+
+
+@receiver([post_save, post_delete], sender=Book)
+@receiver([post_save, post_delete], sender=Author)
+def invalidate_books(sender, instance, **kwargs):
+    if not _in_bulk.get():
+        cache.invalidate(BOOKS_NS)
+        log_change("book" if sender is Book else "author", instance.pk)
@@ -0,0 +1,41 @@
+# api/test_authors.py
+"""
+Tests for the bounded nested books on /api/v1/authors/ and the paginated
+/api/v1/authors/<id>/books/ sub-resource.
+"""
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+
+
+@override_settings(AUTHOR_NESTED_BOOKS=3)
+class AuthorBooksTests(APITestCase):
+    def setUp(self):
+        self.prolific = Author.objects.create(name="Isaac Asimov")
+        self.other = Author.objects.create(name="George Orwell")
+        for year in range(1950, 1975):
+            Book.objects.create(title=f"Book {year}", publication_year=year, author=self.prolific)
+        Book.objects.create(title="1984", publication_year=1949, author=self.other)
+
+    def test_nested_books_are_capped_and_counted(self):
+        # authors with their counts, then the capped books of the whole page
+        # (the last page needs no COUNT)
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/v1/authors/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        asimov = next(a for a in response.data["results"] if a["name"] == "Isaac Asimov")
+        self.assertEqual(asimov["books_count"], 25)
+        self.assertEqual([b["publication_year"] for b in asimov["books"]], [1974, 1973, 1972])
+        self.assertTrue(asimov["books_url"].endswith(f"/api/v1/authors/{self.prolific.pk}/books/"))
+
+    def test_books_sub_resource_is_paginated(self):
+        url = f"/api/v1/authors/{self.prolific.pk}/books/"
+        first = self.client.get(url, {"page_size": 10})
+        self.assertEqual(first.data["count"], 25)
+        self.assertEqual(len(first.data["results"]), 10)
+        self.assertEqual(first.data["results"][0]["publication_year"], 1974)
+        last = self.client.get(url, {"page_size": 10, "page": 3})
+        self.assertEqual(len(last.data["results"]), 5)
+        self.assertEqual(self.client.get("/api/v1/authors/999/books/").status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,136 @@
+# api/test_bulk.py
+"""
+Tests for the bulk Book endpoint /api/books/bulk/ (api/views.py BookBulkView).
+"""
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api import cache
+from api.models import Author, Book
+from api.signals import BOOKS_NS, change_seq
+
+
+class BookBulkTests(APITestCase):
+    url = "/api/books/bulk/"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="tester", password="pass1234")
+        self.client.force_authenticate(self.user)
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.huxley = Author.objects.create(name="Aldous Huxley")
+        self.book = Book.objects.create(title="Animal Farm", publication_year=1945, author=self.orwell)
+
+    def test_requires_auth(self):
+        self.client.force_authenticate(None)
+        response = self.client.post(self.url, [], format="json")
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_create_in_constant_queries(self):
+        items = [
+            {"title": f" Book {i} ", "publication_year": 1950 + i, "author": [self.orwell.pk, self.huxley.pk][i % 2]}
+            for i in range(20)
+        ]
+        # authors, (author, title) check, insert (+ savepoint)
+        with self.assertNumQueries(5):
+            response = self.client.post(self.url, items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(len(response.data), 20)
+        self.assertTrue(all(item["id"] for item in response.data))
+        self.assertEqual(Book.objects.filter(title="Book 3", author=self.huxley).count(), 1)
+
+    def test_create_is_all_or_nothing_with_errors_per_item(self):
+        items = [
+            {"title": "Fine", "publication_year": 1950, "author": self.orwell.pk},
+            {"title": "Future", "publication_year": 9999, "author": self.orwell.pk},
+            {"title": "Nobody's", "publication_year": 1950, "author": 999999},
+        ]
+        response = self.client.post(self.url, items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["errors"]
+        self.assertEqual([e["index"] for e in errors], [1, 2])
+        self.assertIn("publication_year", errors[0]["errors"])
+        self.assertIn("author", errors[1]["errors"])
+        self.assertFalse(Book.objects.filter(title="Fine").exists())
+
+    def test_update(self):
+        other = Book.objects.create(title="1984", publication_year=1949, author=self.orwell)
+        items = [
+            {"id": self.book.pk, "title": "Animal Farm (2nd ed.)"},
+            {"id": other.pk, "author": self.huxley.pk},
+        ]
+        response = self.client.patch(self.url, items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.book.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.book.title, "Animal Farm (2nd ed.)")
+        self.assertEqual((other.title, other.author), ("1984", self.huxley))
+
+    def test_duplicate_natural_keys(self):
+        items = [
+            {"title": "Animal Farm ", "publication_year": 1945, "author": self.orwell.pk},
+            {"title": "Brave New World", "publication_year": 1932, "author": self.huxley.pk},
+            {"title": "Brave New World", "publication_year": 1932, "author": self.huxley.pk},
+        ]
+        response = self.client.post(self.url, items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([e["index"] for e in response.data["errors"]], [0, 2])
+
+    def test_update_unknown_id(self):
+        items = [{"id": self.book.pk, "title": "Changed"}, {"id": 999999, "title": "Ghost"}]
+        response = self.client.patch(self.url, items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.title, "Animal Farm")
+
+    def test_update_rejects_non_integer_ids(self):
+        for pk in [True, str(self.book.pk), 1.0]:
+            response = self.client.patch(self.url, [{"id": pk, "title": "Renamed"}], format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, pk)
+            self.assertEqual(response.data["errors"][0]["errors"]["id"], ["Expected an integer id."])
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.title, "Animal Farm")
+
+    def test_update_repeated_id(self):
+        items = [{"id": self.book.pk, "title": "A"}, {"id": self.book.pk, "title": "B"}]
+        response = self.client.patch(self.url, items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([e["index"] for e in response.data["errors"]], [1])
+        self.assertIn("id", response.data["errors"][0]["errors"])
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.title, "Animal Farm")
+
+    def test_delete(self):
+        other = Book.objects.create(title="1984", publication_year=1949, author=self.orwell)
+        response = self.client.delete(self.url, {"ids": [self.book.pk, other.pk]}, format="json")
+        self.assertEqual(response.data, {"deleted": 2})
+        self.assertFalse(Book.objects.exists())
+
+    def test_delete_unknown_id_deletes_nothing(self):
+        response = self.client.delete(self.url, {"ids": [self.book.pk, 999999]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertTrue(Book.objects.filter(pk=self.book.pk).exists())
+
+    def test_rejects_non_lists_and_oversized_batches(self):
+        response = self.client.post(self.url, {"title": "x"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(API_BULK_MAX_ITEMS=2):
+            response = self.client.post(self.url, [{}] * 3, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalidates_book_cache_once(self):
+        before = cache.get_generation(BOOKS_NS)
+        items = [{"title": f"B{i}", "publication_year": 1950, "author": self.orwell.pk} for i in range(5)]
+        self.client.post(self.url, items, format="json")
+        self.assertEqual(cache.get_generation(BOOKS_NS), before + 1)
+        self.client.delete(self.url, {"ids": list(Book.objects.values_list("pk", flat=True))}, format="json")
+        self.assertEqual(cache.get_generation(BOOKS_NS), before + 2)
+
+    def test_rejected_requests_leave_the_cache_alone(self):
+        before = (cache.get_generation(BOOKS_NS), change_seq())
+        self.client.patch(self.url, [{"id": 999999, "title": "Ghost"}], format="json")
+        self.client.delete(self.url, {"ids": [self.book.pk, 999999]}, format="json")
+        self.client.post(self.url, [{"title": "No year", "author": self.orwell.pk}], format="json")
+        self.assertEqual((cache.get_generation(BOOKS_NS), change_seq()), before)
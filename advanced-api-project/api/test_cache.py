@@ -0,0 +1,75 @@
+# api/test_cache.py
+"""
+Tests for the anonymous response cache on GET /api/books/ (api/cache.py).
+"""
+import unittest
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache as django_cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api import cache
+from api.models import Author, Book
+from api.signals import BOOKS_NS
+
+REPO = Path(cache.__file__).resolve().parents[2]
+COPIES = [REPO / "django_blog" / "blog" / "cache.py", REPO / "social_media_api" / "posts" / "cache.py"]
+
+
+class BookListCacheTests(APITestCase):
+    def setUp(self):
+        django_cache.clear()
+        self.user = get_user_model().objects.create_user(username="tester", password="pass1234")
+        self.author = Author.objects.create(name="George Orwell")
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.author)
+        self.url = "/api/books/"
+
+    def test_anonymous_repeat_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(cache.stats("books"), {"books": {"hits": 1, "misses": 1}})
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get(self.url)
+        response = self.client.get(f"{self.url}?search=farm")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_book_change_invalidates(self):
+        self.client.get(self.url)
+        Book.objects.create(title="1984", publication_year=1949, author=self.author)
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIn("1984", response.content.decode())
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.login(username="tester", password="pass1234")
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Cache", response)
+
+
+class ResponseCacheModuleTests(APITestCase):
+    def setUp(self):
+        django_cache.clear()
+
+    @unittest.skipUnless(all(path.exists() for path in COPIES), "other projects not checked out")
+    def test_copies_in_other_projects_are_identical(self):
+        source = Path(cache.__file__).read_text()
+        for path in COPIES:
+            with self.subTest(copy=str(path.relative_to(REPO))):
+                self.assertEqual(path.read_text(), source)
+
+    def test_invalidation_is_repeated_on_commit(self):
+        before = cache.get_generation(BOOKS_NS)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                cache.invalidate(BOOKS_NS)
+                self.assertEqual(cache.get_generation(BOOKS_NS), before + 1)
+        self.assertEqual(cache.get_generation(BOOKS_NS), before + 2)
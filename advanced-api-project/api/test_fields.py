@@ -0,0 +1,99 @@
+# api/test_fields.py
+"""
+Tests for sparse fieldsets (?fields=) and ?expand=author on the Book and
+Author endpoints.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+
+
+def selected_columns(sql):
+    return sql.split(" FROM ")[0]
+
+
+class SparseFieldsTests(APITestCase):
+    def setUp(self):
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.book = Book.objects.create(title="Animal Farm", publication_year=1945, author=self.orwell)
+        Book.objects.create(title="1984", publication_year=1949, author=self.orwell)
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, [q["sql"] for q in queries.captured_queries]
+
+    def test_fields_narrow_payload_and_columns(self):
+        response, queries = self.get("/api/books/", {"fields": "id,title"})
+        self.assertEqual(response.data["results"][0], {"id": self.book.pk, "title": "Animal Farm"})
+        page_sql = selected_columns(queries[-1])
+        self.assertIn('"title"', page_sql)
+        self.assertNotIn('"publication_year"', page_sql)
+        self.assertNotIn('"author_id"', page_sql)
+
+    def test_unknown_fields_are_rejected(self):
+        for url in ("/api/books/", f"/api/books/{self.book.pk}/", "/api/v1/authors/"):
+            response = self.client.get(url, {"fields": "id,nope"})
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn("nope", response.data["fields"][0])
+        response = self.client.get("/api/books/", {"fields": "nope"})
+        self.assertEqual(
+            response.data["fields"],
+            ["Unknown field(s): nope. Available: id, title, publication_year, author."],
+        )
+
+    def test_empty_fields_means_all_fields(self):
+        response, _ = self.get("/api/v1/books/", {"fields": "", "expand": ""})
+        self.assertEqual(set(response.data["results"][0]), {"id", "title", "publication_year", "author"})
+        response, _ = self.get(f"/api/books/{self.book.pk}/", {"fields": " , "})
+        self.assertEqual(response.data["title"], "Animal Farm")
+
+    def test_unknown_expansions_are_rejected(self):
+        response = self.client.get("/api/v1/books/", {"expand": "author,publisher"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["expand"], ["Unknown expansion(s): publisher. Expandable: author."])
+        response = self.client.get("/api/v1/authors/", {"expand": "books"})
+        self.assertEqual(response.data["expand"], ["Unknown expansion(s): books. Expandable: none."])
+
+    def test_default_payload_has_no_join(self):
+        response, queries = self.get("/api/v1/books/", {})
+        self.assertEqual(set(response.data["results"][0]), {"id", "title", "publication_year", "author"})
+        self.assertNotIn("JOIN", queries[-1])
+
+    def test_expand_author(self):
+        response, queries = self.get("/api/v1/books/", {"expand": "author", "fields": "title,author"})
+        self.assertEqual(
+            response.data["results"][0],
+            {"title": "Animal Farm", "author": {"id": self.orwell.pk, "name": "George Orwell"}},
+        )
+        self.assertIn("JOIN", queries[-1])
+
+    def test_detail_and_cursor_pages(self):
+        response, _ = self.get(f"/api/books/{self.book.pk}/", {"fields": "title"})
+        self.assertEqual(response.data, {"title": "Animal Farm"})
+
+        response, queries = self.get("/api/v1/books/", {"fields": "id", "paginate": "cursor", "limit": 1})
+        self.assertEqual(len(queries), 1)  # no deferred loads to build the cursor
+        self.assertIsNotNone(response.data["next"])
+
+    def test_author_fields_skip_count_and_prefetch(self):
+        _, full = self.get("/api/v1/authors/", {})
+        response, sparse = self.get("/api/v1/authors/", {"fields": "id,name"})
+        self.assertEqual(response.data["results"], [{"id": self.orwell.pk, "name": "George Orwell"}])
+        self.assertLess(len(sparse), len(full))
+        self.assertFalse(any("api_book" in sql for sql in sparse))
+
+    def test_writes_ignore_fields(self):
+        user = get_user_model().objects.create_user(username="tester", password="pass1234")
+        self.client.force_authenticate(user)
+        response = self.client.post(
+            "/api/v1/books/?fields=id",
+            {"title": "Homage to Catalonia", "publication_year": 1938, "author": self.orwell.pk},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["author"], self.orwell.pk)
@@ -0,0 +1,44 @@
+# api/test_filters.py
+"""
+Tests for the per-view-class filter and serializer metadata (api/filters.py).
+"""
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from api.filters import CachedDjangoFilterBackend
+from api.models import Author, Book
+from api.serializers import BookSerializer
+from api.views import BookListView, BookViewSet
+
+
+class ViewMetadataCacheTests(APITestCase):
+    def setUp(self):
+        orwell = Author.objects.create(name="George Orwell")
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=orwell)
+        Book.objects.create(title="1984", publication_year=1949, author=orwell)
+
+    def titles(self, url, params):
+        return [b["title"] for b in self.client.get(url, params).data["results"]]
+
+    def test_filterset_class_and_backends_are_reused(self):
+        self.titles("/api/v1/books/", {"publication_year": 1945})
+        backends = BookViewSet.get_filter_backend_instances()
+        filterset = CachedDjangoFilterBackend.filterset_classes[(BookViewSet, Book)]
+
+        self.titles("/api/v1/books/", {"publication_year": 1949})
+        self.assertIs(BookViewSet.get_filter_backend_instances(), backends)
+        self.assertIs(CachedDjangoFilterBackend.filterset_classes[(BookViewSet, Book)], filterset)
+        self.assertIsNot(BookListView.get_filter_backend_instances()[0], backends[0])
+
+    def test_same_results_with_cache_off(self):
+        params = {"publication_year__gte": 1940, "search": "farm"}
+        cached = self.titles("/api/v1/books/", params)
+        with override_settings(API_VIEW_METADATA_CACHE=False):
+            self.assertEqual(self.titles("/api/v1/books/", params), cached)
+        self.assertEqual(cached, ["Animal Farm"])
+
+    def test_serializer_fields_are_copies(self):
+        first, second = BookSerializer(), BookSerializer(fields=["id"])
+        self.assertEqual(list(first.fields), ["id", "title", "publication_year", "author"])
+        self.assertEqual(list(second.fields), ["id"])
+        self.assertIsNot(first.fields["id"], BookSerializer().fields["id"])
@@ -0,0 +1,84 @@
+# api/test_import.py
+"""
+Tests for the catalog import (api/importer.py): the import_catalog command
+and POST /api/books/import/.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.importer import CatalogImporter
+from api.models import Author, Book
+
+CSV = (
+    "title,publication_year,author\n"
+    "Animal Farm,1945,George Orwell\n"
+    "1984,1949,  george   ORWELL \n"
+    "Brave New World,1932,Aldous Huxley\n"
+    "Future Book,9999,Aldous Huxley\n"
+    ",1950,Nobody\n"
+)
+
+
+class CatalogImportTests(APITestCase):
+    def setUp(self):
+        self.orwell = Author.objects.create(name="George Orwell")
+        Book.objects.create(title="Animal Farm", publication_year=1900, author=self.orwell)
+
+    def test_upserts_by_natural_key_and_dedupes_authors(self):
+        stats = CatalogImporter(batch_size=2).run(StringIO(CSV), "csv")
+        self.assertEqual((stats.rows, stats.upserted, stats.skipped), (5, 3, 2))
+        self.assertEqual(stats.authors_created, 1)
+        self.assertEqual([e["line"] for e in stats.errors], [5, 6])
+
+        self.assertEqual(Author.objects.count(), 2)
+        self.assertEqual(Book.objects.count(), 3)
+        self.assertEqual(Book.objects.get(title="Animal Farm").publication_year, 1945)
+        self.assertEqual(Book.objects.get(title="1984").author, self.orwell)
+
+    def test_ndjson_and_duplicate_rows_in_a_batch(self):
+        lines = [
+            json.dumps({"title": "Emma", "publication_year": 1815, "author": "Jane Austen"}),
+            "",
+            "not json",
+            json.dumps({"title": "Emma", "publication_year": 1816, "author": "jane austen"}),
+        ]
+        stats = CatalogImporter().run(lines, "ndjson")
+        self.assertEqual((stats.rows, stats.upserted, stats.skipped), (3, 1, 1))
+        self.assertEqual(Book.objects.get(title="Emma").publication_year, 1816)
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write(CSV)
+        self.addCleanup(os.remove, handle.name)
+        out = StringIO()
+        call_command("import_catalog", handle.name, "--batch-size", "2", stdout=out, stderr=StringIO())
+        self.assertIn("5 rows", out.getvalue())
+        self.assertIn("line 5:", out.getvalue())
+        self.assertEqual(Book.objects.count(), 3)
+
+    def test_endpoint(self):
+        url = "/api/books/import/"
+        response = self.client.post(url, CSV, content_type="text/csv")
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+        user = get_user_model().objects.create_user(username="tester", password="pass1234")
+        self.client.force_authenticate(user)
+        response = self.client.post(url, CSV, content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["upserted"], response.data["skipped"]), (3, 2))
+
+        response = self.client.post(url, "x", content_type="application/xml")
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_endpoint_browsable_get_is_not_allowed(self):
+        user = get_user_model().objects.create_user(username="tester", password="pass1234")
+        self.client.force_authenticate(user)
+        response = self.client.get("/api/books/import/", HTTP_ACCEPT="text/html")
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,114 @@
+# api/test_pagination.py
+"""
+Tests for the Book list pagination (api/pagination.py): limit/offset with
+optional counts, and cursor pages.
+"""
+from base64 import b64encode
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+
+
+class BookPaginationTests(APITestCase):
+    url = "/api/v1/books/"
+
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name="Isaac Asimov")
+        Book.objects.bulk_create(
+            [Book(title=f"Book {i:02d}", publication_year=1950 + i % 7, author=author) for i in range(30)]
+        )
+
+    def titles(self, response):
+        return [b["title"] for b in response.data["results"]]
+
+    def test_limit_offset_walks_the_default_ordering(self):
+        expected = list(Book.objects.values_list("title", flat=True))
+        seen, response = [], self.client.get(self.url, {"limit": 8})
+        while True:
+            seen.extend(self.titles(response))
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(seen, expected)
+
+    def test_count_modes(self):
+        exact = self.client.get(self.url, {"limit": 5, "count": "exact"}).data
+        self.assertEqual((exact["count"], exact["count_estimated"]), (30, False))
+
+        none = self.client.get(self.url, {"limit": 5, "count": "none"}).data
+        self.assertIsNone(none["count"])
+        self.assertIsNotNone(none["next"])
+
+        with override_settings(API_COUNT_CAP=40):
+            below_cap = self.client.get(self.url, {"limit": 5}).data
+        self.assertEqual((below_cap["count"], below_cap["count_estimated"]), (30, False))
+
+        last = self.client.get(self.url, {"limit": 5, "offset": 28, "count": "none"}).data
+        self.assertEqual(last["count"], 30)  # known for free on the last page
+
+    @override_settings(API_COUNT_CAP=10)
+    def test_count_above_cap_without_planner_estimate_is_null(self):
+        # SQLite: no EXPLAIN row estimate, and the cap is not a count
+        response = self.client.get(self.url, {"limit": 5}).data
+        self.assertEqual((response["count"], response["count_estimated"]), (None, False))
+        self.assertIsNotNone(response["next"])
+
+        with mock.patch("api.pagination.planner_estimate", return_value=5):
+            response = self.client.get(self.url, {"limit": 5}).data
+        # never below what was already counted
+        self.assertEqual((response["count"], response["count_estimated"]), (11, True))
+        with mock.patch("api.pagination.planner_estimate", return_value=42):
+            response = self.client.get(self.url, {"limit": 5}).data
+        self.assertEqual((response["count"], response["count_estimated"]), (42, True))
+
+    def test_count_free_page_costs_one_query(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {"limit": 5, "count": "none"})
+
+    def test_cursor_pages(self):
+        expected = list(Book.objects.order_by("publication_year", "title", "id").values_list("title", flat=True))
+        seen, response = [], self.client.get(self.url, {"paginate": "cursor", "limit": 7})
+        while True:
+            seen.extend(self.titles(response))
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(seen, expected)
+
+    def test_cursor_is_a_keyset_on_the_whole_ordering(self):
+        # ties on (publication_year, title): only the id tells them apart
+        Book.objects.bulk_create([
+            Book(title="Book 03", publication_year=1953, author=Author.objects.create(name=f"Author {i}"))
+            for i in range(5)
+        ])
+        expected = list(Book.objects.order_by("publication_year", "title", "id").values_list("id", flat=True))
+        seen, pages = [], []
+        response = self.client.get(self.url, {"paginate": "cursor", "limit": 2, "ordering": "-title"})
+        while True:
+            seen.extend(b["id"] for b in response.data["results"])
+            pages.append(response)
+            if not response.data["next"]:
+                break
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(response.data["next"])
+            sql = queries.captured_queries[-1]["sql"]
+            self.assertNotIn("OFFSET", sql.upper())
+        self.assertEqual(seen, expected)  # ?ordering= does not apply to cursor pages
+
+        seen, response = [], pages[-1]
+        while response.data["previous"]:
+            response = self.client.get(response.data["previous"])
+            seen[:0] = [b["id"] for b in response.data["results"]]
+        self.assertEqual(seen, expected[:len(seen)])
+        self.assertEqual(len(seen) + len(pages[-1].data["results"]), len(expected))
+
+    def test_malformed_cursor_is_404(self):
+        for position in ["nope", "[1950]", '[1950, 3, 1]', '["1950", "Book 00", 1]']:
+            cursor = b64encode(f"p={position}".encode()).decode()
+            self.assertEqual(self.client.get(self.url, {"cursor": cursor}).status_code, 404, position)
@@ -0,0 +1,202 @@
+# api/test_performance.py
+"""
+Query-count and latency regression harness for the Book/Author endpoints.
+
+Every endpoint is requested against catalogs of PERF_SIZES books, with the
+page size (?limit=) equal to the catalog size. The number of queries must
+not depend on it: a lost select_related/prefetch (an N+1) fails the test
+with the counts per size.
+
+Latency is measured too (PERF_REPEAT runs per endpoint and size). Set
+PERF_REPORT=1 to print p50/p95 per endpoint, and PERF_P95_BUDGET_MS to
+also fail when an endpoint's p95 goes over budget; timings vary too much
+between machines to enforce by default.
+
+Search is the exception: its cost grows with the catalog, not the page, so
+SearchLatencyTests runs it on PERF_SEARCH_SIZE books (a realistic catalog).
+What it always checks is that edits are replayed into the in-process
+index rather than rebuilding it; PERF_SEARCH_P95_BUDGET_MS adds a p95
+budget for the searches, off by default like PERF_P95_BUDGET_MS.
+
+    PERF_SIZES=10,100,500 PERF_REPORT=1 python manage.py test api.test_performance
+"""
+import json
+import os
+import statistics
+import sys
+import time
+from base64 import b64encode
+from unittest import mock
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from api import cache, search
+from api.models import Author, Book
+from api.pagination import BookCursorPagination
+from api.signals import BOOKS_NS, bulk_changes
+
+SIZES = tuple(int(n) for n in os.getenv("PERF_SIZES", "5,25,100").split(","))
+REPEAT = int(os.getenv("PERF_REPEAT", "5"))
+REPORT = os.getenv("PERF_REPORT") == "1"
+P95_BUDGET_MS = float(os.getenv("PERF_P95_BUDGET_MS", "0"))
+SEARCH_SIZE = int(os.getenv("PERF_SEARCH_SIZE", "20000"))
+SEARCH_P95_BUDGET_MS = float(os.getenv("PERF_SEARCH_P95_BUDGET_MS", "0"))
+SEARCH_WORDS = "the of number farm wind animal river night house war peace time dark star light city".split()
+
+
+def cursor_after(book):
+    """A ?cursor= for the page after `book` (see BookCursorPagination)."""
+    position = [getattr(book, field) for field in BookCursorPagination.ordering]
+    return b64encode(urlencode({"p": json.dumps(position)}).encode()).decode()
+
+
+def endpoints(first_book):
+    """(label, url, params); the page size is added per catalog size."""
+    ordered = Book.objects.order_by(*BookCursorPagination.ordering)
+    middle = ordered[ordered.count() // 2]
+    return [
+        ("list", "/api/books/", {}),
+        ("list, exact count", "/api/books/", {"count": "exact"}),
+        ("detail", f"/api/books/{first_book.pk}/", {}),
+        ("filtered", "/api/books/", {"publication_year__gte": 1900, "author__name__icontains": "author"}),
+        ("search", "/api/books/", {"search": "book"}),
+        ("ordered", "/api/books/", {"ordering": "-title"}),
+        ("sparse fields", "/api/books/", {"fields": "id,title"}),
+        ("expand author", "/api/v1/books/", {"expand": "author"}),
+        ("cursor page", "/api/v1/books/", {"paginate": "cursor"}),
+        ("deep cursor page", "/api/v1/books/", {"cursor": cursor_after(middle)}),
+        ("authors", "/api/v1/authors/", {}),
+        ("author's books", f"/api/v1/authors/{first_book.author_id}/books/", {}),
+        ("stats by author", "/api/books/stats/", {"group_by": "author"}),
+    ]
+
+
+def percentile(timings, p):
+    if len(timings) < 2:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method="inclusive")[p - 1]
+
+
+class QueryBudgetTests(APITestCase):
+    report = []
+
+    def setUp(self):
+        # A logged-in session bypasses the anonymous response cache (its two
+        # session/user queries are the same for every request)
+        get_user_model().objects.create_user(username="perf", password="pass1234")
+        self.client.login(username="perf", password="pass1234")
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if REPORT and cls.report:
+            out = sys.stderr
+            out.write(f"\n{'endpoint':<20}{'books':>7}{'queries':>9}{'p50 ms':>9}{'p95 ms':>9}\n")
+            for label, size, queries, p50, p95 in cls.report:
+                out.write(f"{label:<20}{size:>7}{queries:>9}{p50:>9.2f}{p95:>9.2f}\n")
+
+    def seed(self, size):
+        # bulk_create sends no signals
+        with bulk_changes():
+            Book.objects.all().delete()
+            Author.objects.all().delete()
+            authors = Author.objects.bulk_create(
+                [Author(name=f"Author {i:03d}") for i in range(max(2, size // 5))]
+            )
+            Book.objects.bulk_create([
+                Book(title=f"Book {i:04d}", publication_year=1900 + i % 120, author=authors[i % len(authors)])
+                for i in range(size)
+            ])
+        return Book.objects.order_by("pk").first()
+
+    def request(self, url, params):
+        if url.endswith("/stats/"):
+            cache.invalidate(BOOKS_NS)  # memoized for every client
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, (url, params, response.content[:200]))
+        return response
+
+    def test_query_counts_do_not_grow_with_page_size(self):
+        counts = {}
+        for size in SIZES:
+            first = self.seed(size)
+            for label, url, params in endpoints(first):
+                params = {**params, "limit": size, "page_size": size}
+                self.request(url, params)  # warm up (e.g. rebuild the search index)
+
+                with CaptureQueriesContext(connection) as queries:
+                    self.request(url, params)
+                # Read now: the next request resets connection.queries
+                count = counts.setdefault(label, {})[size] = len(queries)
+
+                timings = []
+                for _ in range(REPEAT):
+                    start = time.perf_counter()
+                    self.request(url, params)
+                    timings.append((time.perf_counter() - start) * 1000)
+                p50, p95 = percentile(timings, 50), percentile(timings, 95)
+                self.report.append((label, size, count, p50, p95))
+                if P95_BUDGET_MS:
+                    self.assertLessEqual(p95, P95_BUDGET_MS, f"{label} with {size} books: p95 {p95:.1f} ms")
+
+        for label, by_size in counts.items():
+            with self.subTest(endpoint=label):
+                self.assertEqual(
+                    len(set(by_size.values())), 1,
+                    f"{label}: query count grows with page size {by_size}",
+                )
+
+
+class SearchLatencyTests(APITestCase):
+    searches = ["nu", "numb", "the", "farm wind", "number 3999", "author 0001", "zzz"]
+
+    @classmethod
+    def setUpTestData(cls):
+        with bulk_changes():
+            authors = Author.objects.bulk_create(
+                [Author(name=f"Author {i:04d} {SEARCH_WORDS[i % 16].title()}") for i in range(SEARCH_SIZE // 20)]
+            )
+            Book.objects.bulk_create([
+                Book(
+                    title=" ".join(SEARCH_WORDS[(i * k) % 16] for k in (1, 3, 7)).title() + f" {i}",
+                    publication_year=1900 + i % 120,
+                    author=authors[i % len(authors)],
+                )
+                for i in range(SEARCH_SIZE)
+            ])
+
+    def setUp(self):
+        get_user_model().objects.create_user(username="perf", password="pass1234")
+        self.client.login(username="perf", password="pass1234")
+
+    def search(self, term):
+        start = time.perf_counter()
+        response = self.client.get("/api/books/", {"search": term, "limit": 20})
+        elapsed = (time.perf_counter() - start) * 1000
+        self.assertEqual(response.status_code, 200)
+        return elapsed
+
+    def test_search_on_a_realistic_catalog(self):
+        self.search("warm up")  # builds the index once per process
+        book = Book.objects.order_by("pk").first()
+        timings = []
+        with mock.patch.object(
+            search.InProcessTrigramIndex, "rebuild", autospec=True, side_effect=search.InProcessTrigramIndex.rebuild
+        ) as rebuild:
+            for i in range(REPEAT):
+                for term in self.searches:
+                    timings.append(self.search(term))
+                book.title = f"Edited {i}"
+                book.save()
+                timings.append(self.search("edited"))
+        # every write is replayed into the index, never a reload
+        self.assertEqual(rebuild.call_count, 0)
+        p95 = percentile(timings, 95)
+        if REPORT:
+            sys.stderr.write(f"\nsearch, {SEARCH_SIZE} books: p50 {percentile(timings, 50):.2f} ms, p95 {p95:.2f} ms\n")
+        if SEARCH_P95_BUDGET_MS:
+            self.assertLessEqual(p95, SEARCH_P95_BUDGET_MS, f"search on {SEARCH_SIZE} books: p95 {p95:.1f} ms")
@@ -0,0 +1,95 @@
+# api/test_search.py
+"""
+Tests for the ranked Book search (api/search.py).
+"""
+from unittest import mock
+
+from django.core.cache import cache as default_cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+from api.search import InProcessTrigramIndex
+from api.signals import bulk_changes
+
+
+class BookSearchTests(APITestCase):
+    url = "/api/v1/books/"
+
+    def setUp(self):
+        default_cache.clear()
+        self.orwell = orwell = Author.objects.create(name="George Orwell")
+        self.farmer = Author.objects.create(name="Farmer Giles")
+        Book.objects.create(title="The Wind on the Farm", publication_year=1960, author=self.farmer)
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=orwell)
+        Book.objects.create(title="Farm Animals", publication_year=1990, author=orwell)
+        Book.objects.create(title="Nineteen Eighty-Four", publication_year=1949, author=orwell)
+
+    def titles(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [b["title"] for b in response.data["results"]]
+
+    def test_prefix_matches_rank_first(self):
+        titles = self.titles({"search": "farm"})
+        self.assertEqual(titles[0], "Farm Animals")
+        self.assertEqual(set(titles), {"Farm Animals", "Animal Farm", "The Wind on the Farm"})
+
+    def test_matches_author_name(self):
+        titles = self.titles({"search": "orwell"})
+        self.assertEqual(set(titles), {"Animal Farm", "Farm Animals", "Nineteen Eighty-Four"})
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.titles({"search": "farm orwell"}), ["Farm Animals", "Animal Farm"])
+        self.assertEqual(self.titles({"search": "farm nowhere"}), [])
+
+    def test_explicit_ordering_overrides_rank(self):
+        titles = self.titles({"search": "farm", "ordering": "publication_year"})
+        self.assertEqual(titles, ["Animal Farm", "The Wind on the Farm", "Farm Animals"])
+
+    def test_legacy_q_param(self):
+        self.assertEqual(self.titles({"q": "eighty"}), ["Nineteen Eighty-Four"])
+
+    def test_short_terms_still_match(self):
+        self.assertEqual(set(self.titles({"search": "ni"})),
+                         {"Animal Farm", "Farm Animals", "Nineteen Eighty-Four"})
+
+    def test_index_follows_writes(self):
+        self.assertEqual(self.titles({"search": "coming"}), [])
+        Book.objects.create(title="Coming Up for Air", publication_year=1939, author=self.farmer)
+        self.assertEqual(self.titles({"search": "coming"}), ["Coming Up for Air"])
+
+    @override_settings(API_SEARCH_MAX_CANDIDATES=1)
+    def test_unselective_terms_are_filtered_in_sql(self):
+        # "farm" is in three books: too many candidates, so no ranking
+        self.assertEqual(self.titles({"search": "farm"}),
+                         ["Animal Farm", "The Wind on the Farm", "Farm Animals"])
+        # a selective term still ranks what the other one filters
+        self.assertEqual(self.titles({"search": "farm giles"}), ["The Wind on the Farm"])
+
+    @override_settings(API_SEARCH_MAX_RESULTS=1)
+    def test_only_the_best_matches_are_kept(self):
+        self.assertEqual(self.titles({"search": "farm"}), ["Farm Animals"])
+
+    def test_index_replays_changes_without_reloading(self):
+        self.titles({"search": "farm"})
+        book = Book.objects.get(title="Animal Farm")
+        with mock.patch.object(InProcessTrigramIndex, "rebuild") as rebuild:
+            book.title = "Animal Ranch"
+            book.save()
+            self.assertEqual(self.titles({"search": "ranch"}), ["Animal Ranch"])
+            self.assertNotIn("Animal Ranch", self.titles({"search": "farm"}))
+
+            self.farmer.name = "Giles Plowman"
+            self.farmer.save()
+            self.assertEqual(self.titles({"search": "plowman"}), ["The Wind on the Farm"])
+
+            Book.objects.get(title="Farm Animals").delete()
+            self.assertEqual(self.titles({"search": "farm"}), ["The Wind on the Farm"])
+        rebuild.assert_not_called()
+
+    def test_bulk_changes_reload_the_index(self):
+        self.titles({"search": "farm"})
+        with bulk_changes():
+            Book.objects.bulk_create([Book(title="Farmhouse", publication_year=2001, author=self.orwell)])
+        self.assertEqual(self.titles({"search": "farmh"}), ["Farmhouse"])
@@ -0,0 +1,49 @@
+# api/test_stats.py
+"""
+Tests for the Book aggregates endpoint /api/books/stats/.
+"""
+from django.core.cache import cache as django_cache
+from rest_framework.test import APITestCase
+
+from api.models import Author, Book
+
+
+class BookStatsTests(APITestCase):
+    url = "/api/books/stats/"
+
+    def setUp(self):
+        django_cache.clear()
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.huxley = Author.objects.create(name="Aldous Huxley")
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.orwell)
+        Book.objects.create(title="1984", publication_year=1949, author=self.orwell)
+        Book.objects.create(title="Brave New World", publication_year=1932, author=self.huxley)
+        Book.objects.create(title="Island", publication_year=1962, author=self.huxley)
+        Book.objects.create(title="Homage to Catalonia", publication_year=1938, author=self.orwell)
+
+    def test_group_by_year(self):
+        data = self.client.get(self.url).data
+        self.assertEqual(data["group_by"], "publication_year")
+        self.assertEqual(data["total"], 5)
+        self.assertEqual(data["results"][0], {"publication_year": 1932, "count": 1})
+
+    def test_group_by_decade_with_filters(self):
+        data = self.client.get(self.url, {"group_by": "decade", "author__name__icontains": "orwell"}).data
+        self.assertEqual(data["results"], [{"decade": 1930, "count": 1}, {"decade": 1940, "count": 2}])
+        self.assertEqual(data["total"], 3)
+
+    def test_group_by_author(self):
+        data = self.client.get(self.url, {"group_by": "author", "limit": 1}).data
+        self.assertEqual(data["results"], [{"author": self.orwell.pk, "name": "George Orwell", "count": 3}])
+        self.assertEqual(data["total"], 5)
+
+    def test_invalid_group(self):
+        self.assertEqual(self.client.get(self.url, {"group_by": "title"}).status_code, 400)
+
+    def test_cached_until_books_change(self):
+        self.client.get(self.url, {"group_by": "decade"})
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {"group_by": "decade"})
+        Book.objects.create(title="Coming Up for Air", publication_year=1939, author=self.orwell)
+        data = self.client.get(self.url, {"group_by": "decade"}).data
+        self.assertEqual(data["results"][0], {"decade": 1930, "count": 3})
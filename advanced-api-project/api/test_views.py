@@ -8,6 +8,8 @@ Covers:
 - Filtering (django-filter), Searching (SearchFilter), Ordering (OrderingFilter)
 - Permissions: anonymous can read; authenticated required for create/update/delete
 - Session login flow with self.client.login (proves auth + satisfies checker)
+
+List responses are paginated: items are under "results" (api/pagination.py).
 """
 
 from datetime import date
@@ -57,7 +59,7 @@ class BookAPITests(APITestCase):
     def test_list_public_ok(self):
         response = self.client.get(self.url_list)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 3)
+        self.assertGreaterEqual(len(response.data["results"]), 3)
 
     def test_detail_public_ok(self):
         response = self.client.get(self.url_detail)
@@ -136,33 +138,33 @@ class BookAPITests(APITestCase):
             f"{self.url_list}?publication_year__gte=1930&publication_year__lte=1946&author__name__icontains=orwell"
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        titles = [b["title"] for b in response.data]
+        titles = [b["title"] for b in response.data["results"]]
         self.assertEqual(titles, ["Animal Farm"])  # only 1945 Orwell
 
     def test_filter_by_author_id(self):
         response = self.client.get(f"{self.url_list}?author={self.author_orwell.id}")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        titles = sorted([b["title"] for b in response.data])
+        titles = sorted([b["title"] for b in response.data["results"]])
         self.assertEqual(titles, ["1984", "Animal Farm"])
 
     # ---------- Search ----------
     def test_search_title(self):
         response = self.client.get(f"{self.url_list}?search=farm")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        titles = [b["title"] for b in response.data]
+        titles = [b["title"] for b in response.data["results"]]
         self.assertEqual(titles, ["Animal Farm"])
 
     def test_q_backward_compat(self):
         response = self.client.get(f"{self.url_list}?q=1984")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        titles = [b["title"] for b in response.data]
+        titles = [b["title"] for b in response.data["results"]]
         self.assertEqual(titles, ["1984"])
 
     # ---------- Ordering ----------
     def test_ordering_desc_publication_year(self):
         response = self.client.get(f"{self.url_list}?ordering=-publication_year")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        years = [b["publication_year"] for b in response.data]
+        years = [b["publication_year"] for b in response.data["results"]]
         self.assertEqual(years, sorted(years, reverse=True))
 
     # ---------- ViewSet sanity ----------
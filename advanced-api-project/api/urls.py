@@ -8,6 +8,10 @@ from .views import (
     BookListView, BookDetailView, BookCreateView, BookUpdateView, BookDeleteView,
     # Param-based update/delete (import these!)
     BookUpdateByParamView, BookDeleteByParamView,
+    # Bulk create/update/delete
+    BookBulkView, BookImportView,
+    # Aggregates
+    BookStatsView,
 )
 
 # ViewSets under /api/v1/... to avoid collisions with the generic endpoints
@@ -19,6 +23,9 @@ urlpatterns = [
     path("books/", BookListView.as_view(), name="book-list"),
     path("books/<int:pk>/", BookDetailView.as_view(), name="book-detail"),
     path("books/create/", BookCreateView.as_view(), name="book-create"),
+    path("books/stats/", BookStatsView.as_view(), name="book-stats"),
+    path("books/bulk/", BookBulkView.as_view(), name="book-bulk"),
+    path("books/import/", BookImportView.as_view(), name="book-import"),
 
     path("books/update", BookUpdateByParamView.as_view(), name="book-update-no-pk"),
     path("books/delete", BookDeleteByParamView.as_view(), name="book-delete-no-pk"),
@@ -15,54 +15,174 @@ Also provides alias endpoints demanded by checker:
 - /api/books/update[?id=<pk>]  (PUT/PATCH)
 - /api/books/delete[?id=<pk>]  (DELETE)
 
+Bulk endpoints for catalog sync jobs:
+- /api/books/bulk/    (POST create / PATCH update / DELETE, lists of books)
+- /api/books/import/  (POST a CSV/NDJSON catalog, upserted by author name + title)
+
+Aggregates: /api/books/stats/?group_by=publication_year|decade|author, with
+the list filters applied.
+
+Sparse fieldsets (reads): ?fields=id,title and ?expand=author narrow both
+the payload and the SQL (see SparseFieldsViewMixin).
+
 Filtering / Searching / Ordering
-- django-filter (filterset_fields)
-- DRF SearchFilter (?search=)
-- DRF OrderingFilter (?ordering=field or -field)
+- django-filter (filterset_fields); filterset classes and filter backends
+  are built once per view class (api/filters.py)
+- Ranked trigram search (?search=, api/search.py)
+- Ordering (?ordering=field or -field, api/search.py RankedOrderingFilter):
+  search results stay in relevance order unless ?ordering= is given
 """
 
-from django.db.models import Q
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Prefetch
 from django.shortcuts import get_object_or_404
 from django_filters import rest_framework  # required by checker
 
-from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import generics, parsers, viewsets
-from rest_framework.exceptions import ValidationError
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework import generics, parsers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import UnsupportedMediaType, ValidationError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated  # required by checker
-from rest_framework import filters
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from . import cache, importer
 from .models import Author, Book
-from .serializers import AuthorSerializer, BookSerializer
+from .filters import CachedDjangoFilterBackend, CachedFilterBackendsMixin
+from .pagination import BookCursorPagination, BookPagePagination, BookPagination
+from .search import BookSearchFilter, RankedOrderingFilter
+from .serializers import AuthorSerializer, BookSerializer, nested_books_limit
+from .signals import bulk_changes
+
+
+# ---------------------------------------------------------------------
+# Sparse fieldsets
+# ---------------------------------------------------------------------
+def query_list(request, param):
+    """The comma-separated names in ?param=, or None if it is absent or empty."""
+    value = request.query_params.get(param, "")
+    return [name.strip() for name in value.split(",") if name.strip()] or None
+
+
+class SparseFieldsViewMixin:
+    """
+    On GET/HEAD, ?fields=a,b and ?expand=author are passed to the serializer
+    (serializers.SparseFieldsMixin); an empty ?fields= means all fields.
+    Subclasses use requested_fields() / expanded() in get_queryset() to
+    select only what will be serialized.
+    """
+
+    def is_read(self):
+        return self.request.method in cache.SAFE_METHODS
+
+    def requested_fields(self):
+        return query_list(self.request, "fields") if self.is_read() else None
+
+    def expanded(self):
+        return set(query_list(self.request, "expand") or ()) if self.is_read() else set()
+
+    def wants(self, name):
+        fields = self.requested_fields()
+        return fields is None or name in fields
+
+    def get_serializer(self, *args, **kwargs):
+        if self.is_read():
+            kwargs.setdefault("fields", self.requested_fields())
+            kwargs.setdefault("expand", self.expanded())
+        return super().get_serializer(*args, **kwargs)
+
+
+class BookFieldsMixin(SparseFieldsViewMixin):
+    """
+    Book querysets that load just the requested columns, and join the author
+    only for ?expand=author.
+    """
+    # serializer field -> model fields it reads
+    book_columns = {
+        "id": ["id"],
+        "title": ["title"],
+        "publication_year": ["publication_year"],
+        "author": ["author"],
+    }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        expand_author = "author" in self.expanded() and self.wants("author")
+        if expand_author:
+            queryset = queryset.select_related("author")
+        fields = self.requested_fields()
+        if fields is None:
+            return queryset
+
+        columns = {"id"}
+        for name in fields:
+            columns.update(self.book_columns.get(name, ()))
+        if expand_author:
+            columns.update(["author__id", "author__name"])
+        if isinstance(self.paginator, BookPagination) and BookPagination.wants_cursor(self.request):
+            columns.update(BookCursorPagination.ordering)  # the cursor is read from the last row
+        return queryset.only(*columns)
 
 
 # ---------------------------------------------------------------------
 # ViewSets (router-based CRUD) -> mounted under /api/v1/...
 # ---------------------------------------------------------------------
-class AuthorViewSet(viewsets.ModelViewSet):
+class AuthorViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     Router path (see api/urls.py): /api/v1/authors/
     Read: public; Write: requires auth (via IsAuthenticatedOrReadOnly).
+
+    Each author nests only their newest AUTHOR_NESTED_BOOKS books: a sliced
+    prefetch (one ROW_NUMBER() window query for the whole page) instead of
+    every book of every author, plus a books_count annotation.
+    The full list is paginated under /api/v1/authors/<id>/books/.
+    With ?fields=, the prefetch and the count run only if requested.
     """
-    queryset = Author.objects.all().prefetch_related("books")
+    queryset = Author.objects.all()
     serializer_class = AuthorSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == "books":
+            return qs
+        if self.wants("books_count"):
+            qs = qs.annotate(books_count=Count("books"))
+        if self.wants("books"):
+            qs = qs.prefetch_related(
+                Prefetch(
+                    "books",
+                    queryset=Book.objects.order_by("-publication_year", "-id")[:nested_books_limit()],
+                    to_attr="latest_books",
+                )
+            )
+        return qs
+
+    @action(detail=True, methods=["get"], pagination_class=BookPagePagination)
+    def books(self, request, pk=None):
+        """GET /api/v1/authors/<id>/books/ -> every book, newest first, paginated."""
+        author = self.get_object()
+        books = Book.objects.filter(author=author).order_by("-publication_year", "-id")
+        page = self.paginate_queryset(books)
+        return self.get_paginated_response(BookSerializer(page, many=True).data)
 
-class BookViewSet(viewsets.ModelViewSet):
+
+class BookViewSet(CachedFilterBackendsMixin, BookFieldsMixin, viewsets.ModelViewSet):
     """
     Router path (see api/urls.py): /api/v1/books/
     Supports:
       - Filtering (django-filter): title, publication_year, author, author__name
-      - Search (?search=): title, author name
+      - Search (?search=): title, author name, ranked by relevance (api/search.py)
       - Ordering (?ordering=): title, publication_year, id
+      - Sparse fieldsets (?fields=id,title) and ?expand=author on reads
     """
-    queryset = Book.objects.select_related("author").all()
+    queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = BookPagination  # limit/offset, or ?paginate=cursor
 
     # Explicit so it works even if not set globally in settings.py
-    filter_backends = [rest_framework.DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [CachedDjangoFilterBackend, BookSearchFilter, RankedOrderingFilter]
 
     # django-filter config
     filterset_fields = {
@@ -81,7 +201,7 @@ class BookViewSet(viewsets.ModelViewSet):
 # ---------------------------------------------------------------------
 # Generic views (explicit endpoints under /api/books/...)
 # ---------------------------------------------------------------------
-class BookListView(generics.ListAPIView):
+class BookListView(cache.AnonymousResponseCacheMixin, CachedFilterBackendsMixin, BookFieldsMixin, generics.ListAPIView):
     """
     GET /api/books/
 
@@ -91,20 +211,32 @@ class BookListView(generics.ListAPIView):
       ?author=1
       ?author__name__icontains=orwell
 
-    Search (DRF SearchFilter):
+    Search (api/search.py BookSearchFilter, trigram-indexed, relevance-ranked):
       ?search=farm
 
-    Ordering (DRF OrderingFilter):
+    Ordering (api/search.py RankedOrderingFilter; relevance first when searching):
       ?ordering=-publication_year,title
 
     Backward-compat:
-      We still honor ?q= as a shortcut for (title OR author__name) icontains.
+      We still honor ?q= as a shortcut for ?search= (title OR author__name).
+
+    Pagination (api/pagination.py BookPagination):
+      ?limit=50&offset=100[&count=exact|estimate|none]
+      ?paginate=cursor[&limit=50], then follow "next"
+
+    Sparse fieldsets:
+      ?fields=id,title            only these fields, only these columns
+      ?expand=author              author as {"id", "name"} (one JOIN)
+
+    Anonymous responses are cached per path + query string (see api/cache.py).
     """
+    cache_namespace = "books"
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
-    queryset = Book.objects.select_related("author").all()
+    pagination_class = BookPagination
+    queryset = Book.objects.all()
 
-    filter_backends = [rest_framework.DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [CachedDjangoFilterBackend, BookSearchFilter, RankedOrderingFilter]
     filterset_fields = {
         "title": ["exact", "icontains", "istartswith"],
         "publication_year": ["exact", "gte", "lte"],
@@ -115,21 +247,74 @@ class BookListView(generics.ListAPIView):
     ordering_fields = ["title", "publication_year", "id"]
     ordering = ["publication_year", "title"]
 
-    def get_queryset(self):
-        qs = super().get_queryset()
-        # Backward compatibility for previous ?q= param
-        q = self.request.query_params.get("q")
-        if q:
-            qs = qs.filter(Q(title__icontains=q) | Q(author__name__icontains=q))
-        return qs
 
 
-class BookDetailView(generics.RetrieveAPIView):
+class BookStatsView(CachedFilterBackendsMixin, generics.GenericAPIView):
+    """
+    GET /api/books/stats/?group_by=publication_year|decade|author
+
+    Book counts per group, computed with one GROUP BY in the database over
+    the same django-filter filters as the list (?author__name__icontains=...,
+    ?publication_year__gte=...). Years and decades come back in ascending
+    order; authors by count, capped at ?limit= (default API_PAGE_SIZE).
+
+    Results are cached for every client in the "books" namespace, so any
+    Book/Author change invalidates them (api/signals.py).
+    """
+    queryset = Book.objects.all()
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    filter_backends = [CachedDjangoFilterBackend]
+    filterset_fields = BookListView.filterset_fields
+    cache_namespace = "books"
+    max_limit = 1000
+
+    # group -> (values() keys, extra annotations, ordering)
+    groups = {
+        "publication_year": (["publication_year"], {}, ["publication_year"]),
+        "decade": (["decade"], {"decade": F("publication_year") / 10 * 10}, ["decade"]),
+        "author": (["author", "author__name"], {}, ["-count", "author__name", "author"]),
+    }
+
+    def get(self, request, *args, **kwargs):
+        group_by = request.query_params.get("group_by", "publication_year")
+        if group_by not in self.groups:
+            raise ValidationError({"group_by": [f"Choose one of: {', '.join(self.groups)}."]})
+        limit = None
+        if group_by == "author":
+            limit = request.query_params.get("limit", getattr(settings, "API_PAGE_SIZE", 50))
+            try:
+                limit = min(max(int(limit), 1), self.max_limit)
+            except ValueError:
+                raise ValidationError({"limit": ["A valid integer is required."]})
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(cache.memoize(
+            self.cache_namespace, request, lambda: self.aggregate(queryset, group_by, limit)
+        ))
+
+    def aggregate(self, queryset, group_by, limit):
+        keys, annotations, ordering = self.groups[group_by]
+        queryset = queryset.order_by()
+        rows = queryset.annotate(**annotations).values(*keys).annotate(count=Count("id")).order_by(*ordering)
+        if limit is not None:
+            rows = rows[:limit]
+        results = [
+            {"author": row["author"], "name": row["author__name"], "count": row["count"]}
+            if group_by == "author" else row
+            for row in rows
+        ]
+        if limit is None:
+            total = sum(row["count"] for row in results)
+        else:
+            total = queryset.count()
+        return {"group_by": group_by, "total": total, "results": results}
+
+
+class BookDetailView(BookFieldsMixin, generics.RetrieveAPIView):
     """
     GET /api/books/<pk>/
-    Public detail view.
+    Public detail view; takes ?fields= and ?expand=author like the list.
     """
-    queryset = Book.objects.select_related("author").all()
+    queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
@@ -158,7 +343,7 @@ class BookUpdateView(generics.UpdateAPIView):
     Updates a Book (auth required).
     Accepts JSON or multipart/form-data.
     """
-    queryset = Book.objects.select_related("author").all()
+    queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
     parser_classes = [parsers.JSONParser, parsers.FormParser, parsers.MultiPartParser]
@@ -209,7 +394,7 @@ class BookUpdateByParamView(BookLookupByParamMixin, generics.UpdateAPIView):
     PUT/PATCH /api/books/update[/?id=<pk>]
     Auth required. Accepts JSON or multipart/form-data.
     """
-    queryset = Book.objects.select_related("author").all()
+    queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
     parser_classes = [parsers.JSONParser, parsers.FormParser, parsers.MultiPartParser]
@@ -223,3 +408,112 @@ class BookDeleteByParamView(BookLookupByParamMixin, generics.DestroyAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
+
+
+# ---------------------------------------------------------------------
+# Bulk endpoint: many books per request, one transaction
+# ---------------------------------------------------------------------
+def bulk_max_items() -> int:
+    return getattr(settings, "API_BULK_MAX_ITEMS", 1000)
+
+
+def item_errors(detail):
+    """ListSerializer errors ({index: errors} or a list) -> [{"index": i, "errors": ...}]."""
+    if isinstance(detail, list):
+        detail = dict(enumerate(detail))
+    if isinstance(detail, dict) and all(isinstance(key, int) for key in detail):
+        return {"errors": [{"index": i, "errors": e} for i, e in sorted(detail.items()) if e]}
+    return detail
+
+
+class BookBulkView(generics.GenericAPIView):
+    """
+    /api/books/bulk/  (auth required, JSON lists, at most API_BULK_MAX_ITEMS)
+
+      POST    [{"title", "publication_year", "author"}, ...]  -> 201, created books
+      PATCH   [{"id", <fields to change>}, ...]               -> 200, updated books
+              (each id at most once)
+      DELETE  {"ids": [<pk>, ...]}                            -> 200, {"deleted": n}
+
+    Validation uses BookSerializer(many=True), which resolves every item's
+    author in one query; writes are one bulk_create, one bulk_update or one
+    DELETE ... WHERE id IN (...). All or nothing: if any item is invalid
+    nothing is written and the response is 400 with
+    {"errors": [{"index": i, "errors": {...}}, ...]}.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+    parser_classes = [parsers.JSONParser]
+
+    def get_items(self):
+        items = self.request.data
+        if not isinstance(items, list):
+            raise ValidationError("Expected a list of books.")
+        if len(items) > bulk_max_items():
+            raise ValidationError(f"At most {bulk_max_items()} books per request.")
+        return items
+
+    def invalid(self, detail):
+        return Response(item_errors(detail), status=status.HTTP_400_BAD_REQUEST)
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=self.get_items(), many=True)
+        if not serializer.is_valid():
+            return self.invalid(serializer.errors)
+        with bulk_changes(), transaction.atomic():
+            serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        items = self.get_items()
+        ids = {
+            item["id"] for item in items
+            if isinstance(item, dict) and isinstance(item.get("id"), int) and not isinstance(item["id"], bool)
+        }
+        # Validated before bulk_changes(), which invalidates on any exit
+        with transaction.atomic():
+            books = self.get_queryset().select_for_update().in_bulk(ids)
+            serializer = self.get_serializer(books, data=items, many=True, partial=True)
+            if not serializer.is_valid():
+                return self.invalid(serializer.errors)
+            with bulk_changes():
+                serializer.save()
+        return Response(serializer.data)
+
+    def delete(self, request, *args, **kwargs):
+        ids = request.data.get("ids") if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            raise ValidationError({"ids": ["Expected a list of book ids."]})
+        if len(ids) > bulk_max_items():
+            raise ValidationError({"ids": [f"At most {bulk_max_items()} ids per request."]})
+        with transaction.atomic():
+            found = set(self.get_queryset().select_for_update().filter(pk__in=ids).values_list("pk", flat=True))
+            missing = {i: {"id": ["Unknown book id."]} for i, pk in enumerate(ids) if pk not in found}
+            if missing:
+                return self.invalid(missing)
+            with bulk_changes():
+                deleted, _ = self.get_queryset().filter(pk__in=found).delete()
+        return Response({"deleted": deleted})
+
+
+class BookImportView(APIView):
+    """
+    POST /api/books/import/  (auth required)
+
+    Body: a catalog as text/csv or application/x-ndjson (see api/importer.py).
+    The body is streamed, never loaded whole, and upserted in batches;
+    the response is the import summary (rows, upserted, skipped, errors,
+    rows_per_second). A plain APIView: there is no serializer, so the
+    browsable API must not look for one.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        fmt = importer.format_for(request.content_type)
+        if fmt is None:
+            raise UnsupportedMediaType(request.content_type)
+        # request.stream is the raw body; iterating it yields lines
+        lines = (line.decode("utf-8-sig") for line in (request.stream or ()))
+        stats = importer.CatalogImporter().run(lines, fmt)
+        return Response(stats.as_dict())
@@ -0,0 +1,69 @@
+"""
+Show how much of request latency is connection setup.
+
+    python manage.py bench_db_connections --requests 500 --path /api/books/
+
+Replays the same GET through the real WSGI handler (so Django opens/closes
+connections exactly as in production) twice: once with CONN_MAX_AGE=0, i.e.
+a fresh connection per request, and once with a persistent connection.
+Reports mean/p50/p95 latency and how many connections were opened.
+"""
+import statistics
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+
+
+class Command(BaseCommand):
+    help = "Compare request latency with and without persistent DB connections."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--path", default="/api/books/")
+        parser.add_argument("--max-age", type=int, default=600,
+                            help="CONN_MAX_AGE for the persistent run.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'mode':<20}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'connects':>10}")
+        for label, max_age in (("per-request", 0), ("persistent", options["max_age"])):
+            mean, p50, p95, opened = self._run(options["path"], options["requests"], max_age)
+            self.stdout.write(f"{label:<20}{mean:>10.3f}{p50:>10.3f}{p95:>10.3f}{opened:>10}")
+
+    def _run(self, path, count, max_age):
+        handler = WSGIHandler()
+        environ = RequestFactory()._base_environ(
+            PATH_INFO=path, REQUEST_METHOD="GET", SERVER_NAME="localhost"
+        )
+        opened = []
+
+        def on_connect(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        original = connection.settings_dict["CONN_MAX_AGE"]
+        connection.close()
+        connection.settings_dict["CONN_MAX_AGE"] = max_age
+        connection_created.connect(on_connect)
+        timings = []
+        try:
+            self._request(handler, environ)  # warm-up: imports, URL resolver
+            opened.clear()
+            for _ in range(count):
+                start = time.perf_counter()
+                self._request(handler, environ)
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection_created.disconnect(on_connect)
+            connection.settings_dict["CONN_MAX_AGE"] = original
+            connection.close()
+
+        percentiles = statistics.quantiles(timings, n=100)
+        return statistics.mean(timings), percentiles[49], percentiles[94], len(opened)
+
+    @staticmethod
+    def _request(handler, environ):
+        response = handler(dict(environ), lambda status, headers: None)
+        response.close()  # fires request_finished -> close_old_connections
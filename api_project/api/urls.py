@@ -1,13 +1,14 @@
 from django.urls import path, include
 from rest_framework import routers
 from rest_framework.routers import DefaultRouter
-from .views import BookList, BookViewSet, health
+from .views import BookList, BookViewSet, health, db_health
 from rest_framework.authtoken.views import obtain_auth_token
 router = DefaultRouter()
 router.register(r'books_all', BookViewSet, basename='book_all')
 
 urlpatterns = [
     path("health/", health, name="health"),    
+    path("health/db/", db_health, name="health-db"),
     path("auth/token/", obtain_auth_token, name="api-token"),
     path("books/", BookList.as_view(), name="book-list"),
     path("", include(router.urls)),                 
@@ -1,7 +1,8 @@
+from django.db import connections
 from rest_framework import generics, viewsets
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from .permissions import IsAdminOrReadOnly  
  
 from .models import Book
@@ -11,6 +12,24 @@ from .serializers import BookSerializer
 def health(request):
     return Response({"status": "ok"})
 
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def db_health(request):
+    """Connection persistence settings (and pool counters, if any) per DB alias."""
+    stats = {}
+    for alias in connections:
+        conn = connections[alias]
+        stats[alias] = {
+            "vendor": conn.vendor,
+            "conn_max_age": conn.settings_dict.get("CONN_MAX_AGE"),
+            "health_checks": conn.settings_dict.get("CONN_HEALTH_CHECKS"),
+            "connected": conn.connection is not None,
+        }
+        pool = getattr(conn, "pool", None)  # PostgreSQL + OPTIONS["pool"] only
+        if pool is not None:
+            stats[alias]["pool"] = pool.get_stats()
+    return Response(stats)
+
 class BookList(generics.ListAPIView):
     queryset = Book.objects.all().order_by("id")
     serializer_class = BookSerializer
@@ -0,0 +1,50 @@
+# django_blog/blog/context_processors.py
+"""
+Context shared by every blog page.
+
+`tag_cloud` is the TAG_CLOUD_SIZE most used tags, alphabetical, each with a
+`weight` from 1 to 5 for sizing. It is read from Tag.post_count and kept in
+the response cache under the "tag_cloud" namespace, which blog/signals.py
+invalidates whenever a count changes, so a warm page pays no query for it.
+It is lazy: pages that don't render it don't even touch the cache.
+"""
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from . import cache
+from .models import Tag
+from .signals import TAG_CLOUD_NS
+
+WEIGHTS = 5
+
+
+def _weigh(entries):
+    counts = [entry["post_count"] for entry in entries]
+    low, high = min(counts), max(counts)
+    for entry in entries:
+        if high == low:
+            entry["weight"] = 1
+        else:
+            entry["weight"] = 1 + round((entry["post_count"] - low) * (WEIGHTS - 1) / (high - low))
+    return entries
+
+
+def tag_cloud_entries() -> list:
+    store = cache.get_cache()
+    key = f"{cache.KEY_PREFIX}:{TAG_CLOUD_NS}:{cache.get_generation(TAG_CLOUD_NS)}"
+    entries = store.get(key)
+    if entries is None:
+        size = getattr(settings, "TAG_CLOUD_SIZE", 20)
+        entries = list(
+            Tag.objects.filter(post_count__gt=0)
+            .order_by("-post_count", "name")
+            .values("name", "slug", "post_count")[:size]
+        )
+        if entries:
+            entries = sorted(_weigh(entries), key=lambda entry: entry["name"])
+        store.set(key, entries, getattr(settings, "TAG_CLOUD_TTL", 3600))
+    return entries
+
+
+def tag_cloud(request):
+    return {"tag_cloud": SimpleLazyObject(tag_cloud_entries)}
@@ -0,0 +1,126 @@
+# django_blog/blog/feeds.py
+"""
+RSS and Atom feeds: the latest FEED_ITEMS posts, site-wide or for one tag.
+
+Feeds are polled far more often than they change, so each one is wrapped
+in django.views.decorators.http.condition(): Last-Modified is the newest
+published_date in the feed, and the ETag adds the "post_list" cache
+generation (blog/signals.py bumps it on any post or tag change), so edits
+and deletes are noticed too. A poll with nothing new costs one aggregate
+query and is answered 304 before the feed is built.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.db.models import Max
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+from django.views.decorators.http import condition
+
+from . import cache
+from .models import Post, Tag
+from .signals import POST_LIST_NS
+
+
+def feed_size() -> int:
+    return getattr(settings, "FEED_ITEMS", 20)
+
+
+class LatestPostsFeed(Feed):
+    title = "django_blog"
+    description = "Latest posts on django_blog."
+
+    def link(self):
+        return reverse("blog:post_list")
+
+    def items(self):
+        return (
+            Post.objects.select_related("author")
+            .prefetch_related("tags")
+            .order_by("-published_date", "-pk")[:feed_size()]
+        )
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.content).words(60)
+
+    def item_link(self, item):
+        return reverse("blog:post_detail", args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.published_date
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_categories(self, item):
+        return [tag.name for tag in item.tags.all()]
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class TagPostsFeed(LatestPostsFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Tag, slug=slug)
+
+    def title(self, tag):
+        return f'django_blog: posts tagged "{tag.name}"'
+
+    def description(self, tag):
+        return f'Latest posts tagged "{tag.name}" on django_blog.'
+
+    def link(self, tag):
+        return reverse("blog:posts_by_tag", args=[tag.slug])
+
+    def items(self, tag):
+        return (
+            tag.posts.select_related("author")
+            .prefetch_related("tags")
+            .order_by("-published_date", "-pk")[:feed_size()]
+        )
+
+
+class TagPostsAtomFeed(TagPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, tag):
+        return self.description(tag)
+
+
+# ---------------------------------------------------------------------
+# Conditional GET
+# ---------------------------------------------------------------------
+def _newest(request, slug=None):
+    """Newest published_date in the feed; asked for twice per request, queried once."""
+    if not hasattr(request, "_feed_newest"):
+        posts = Post.objects.filter(tags__slug=slug) if slug else Post.objects.all()
+        request._feed_newest = posts.aggregate(newest=Max("published_date"))["newest"]
+    return request._feed_newest
+
+
+def _last_modified(request, slug=None):
+    return _newest(request, slug)
+
+
+def _etag(request, slug=None):
+    newest = _newest(request, slug)
+    raw = "|".join([
+        request.path,
+        newest.isoformat() if newest else "empty",
+        str(cache.get_generation(POST_LIST_NS)),
+        str(feed_size()),
+    ])
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def conditional(feed):
+    """Wrap a Feed instance for use in urls.py with ETag/Last-Modified handling."""
+    return condition(etag_func=_etag, last_modified_func=_last_modified)(feed)
@@ -46,7 +46,8 @@ class PostForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         existing = []
         if self.instance and self.instance.pk:
-            existing = self.instance.tags.values_list("name", flat=True)
+            # .all() is served from prefetch_related("tags") when the view did it
+            existing = [tag.name for tag in self.instance.tags.all()]
         self.fields["tags_input"].initial = ", ".join(existing)
 
 
@@ -0,0 +1,71 @@
+# Full-text search index for posts (see blog/search.py)
+
+from django.db import migrations
+
+SQLITE_CREATE = "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts USING fts5(title, content, tags)"
+SQLITE_DROP = "DROP TABLE IF EXISTS blog_post_fts"
+
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS blog_post_search ("
+    " post_id bigint PRIMARY KEY REFERENCES blog_post(id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,"
+    " document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS blog_post_search_document_idx ON blog_post_search USING GIN (document)",
+]
+POSTGRES_DROP = "DROP TABLE IF EXISTS blog_post_search"
+
+# Backfill existing posts. The SQL is inlined rather than borrowed from
+# blog.search, so later changes there can't alter what this migration does.
+# {tags} is a subquery of one post's tag names, space-separated.
+TAG_NAMES = (
+    "(SELECT {agg} FROM {through} pt JOIN {tag} t ON t.id = pt.tag_id WHERE pt.post_id = p.id)"
+)
+SQLITE_BACKFILL = (
+    "INSERT INTO blog_post_fts(rowid, title, content, tags) "
+    "SELECT p.id, p.title, p.content, COALESCE({tags}, '') FROM {post} p"
+)
+POSTGRES_BACKFILL = (
+    "INSERT INTO blog_post_search(post_id, document) "
+    "SELECT p.id, setweight(to_tsvector('english', p.title), 'A') || "
+    "setweight(to_tsvector('english', COALESCE({tags}, '')), 'B') || "
+    "setweight(to_tsvector('english', p.content), 'C') FROM {post} p "
+    "ON CONFLICT (post_id) DO NOTHING"
+)
+
+
+def backfill_sql(apps, template, agg):
+    Post = apps.get_model("blog", "Post")
+    Tag = apps.get_model("blog", "Tag")
+    tags = TAG_NAMES.format(
+        agg=agg, through=Post.tags.through._meta.db_table, tag=Tag._meta.db_table
+    )
+    return template.format(tags=tags, post=Post._meta.db_table)
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+        schema_editor.execute(backfill_sql(apps, SQLITE_BACKFILL, "group_concat(t.name, ' ')"))
+    elif vendor == "postgresql":
+        for statement in POSTGRES_CREATE:
+            schema_editor.execute(statement)
+        schema_editor.execute(backfill_sql(apps, POSTGRES_BACKFILL, "string_agg(t.name, ' ')"))
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_DROP)
+    elif vendor == "postgresql":
+        schema_editor.execute(POSTGRES_DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_published_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+def normalize_tag_names(apps, schema_editor):
+    """
+    Lower-case existing tag names, merging tags that only differed in case
+    ("Django"/"django") into one, so tag resolution can match on name__in.
+    """
+    Tag = apps.get_model("blog", "Tag")
+    Through = Tag.posts.through
+
+    groups = {}
+    for tag in Tag.objects.order_by("pk"):
+        groups.setdefault(" ".join(tag.name.split()).lower(), []).append(tag)
+
+    for name, tags in groups.items():
+        # Prefer the tag already spelled the normalised way, else the oldest
+        survivor = next((t for t in tags if t.name == name), tags[0])
+        duplicates = [t.pk for t in tags if t.pk != survivor.pk]
+        if duplicates:
+            tagged = set(Through.objects.filter(tag_id=survivor.pk).values_list("post_id", flat=True))
+            moved = set(
+                Through.objects.filter(tag_id__in=duplicates).values_list("post_id", flat=True)
+            ) - tagged
+            Through.objects.bulk_create([Through(post_id=post_id, tag_id=survivor.pk) for post_id in moved])
+            Tag.objects.filter(pk__in=duplicates).delete()
+        if survivor.name != name:
+            survivor.name = name
+            survivor.save(update_fields=["name"])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_post_search_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_tag_names, migrations.RunPython.noop),
+    ]
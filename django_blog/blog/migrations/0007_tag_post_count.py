@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:42
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_post_count(apps, schema_editor):
+    Tag = apps.get_model("blog", "Tag")
+    tags = list(Tag.objects.annotate(n=Count("posts")))
+    for tag in tags:
+        tag.post_count = tag.n
+    Tag.objects.bulk_update(tags, ["post_count"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_normalize_tag_names'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-post_count', 'name'], name='blog_tag_count_name_idx'),
+        ),
+        migrations.RunPython(backfill_post_count, migrations.RunPython.noop),
+    ]
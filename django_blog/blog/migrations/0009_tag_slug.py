@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:03
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def populate_slugs(apps, schema_editor):
+    Tag = apps.get_model("blog", "Tag")
+    taken = set()
+    tags = list(Tag.objects.order_by("pk"))
+    for tag in tags:
+        base = slug = slugify(tag.name, allow_unicode=True)[:50] or "tag"
+        suffix = 1
+        while slug in taken:
+            suffix += 1
+            slug = f"{base}-{suffix}"
+        taken.add(slug)
+        tag.slug = slug
+    Tag.objects.bulk_update(tags, ["slug"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_comment_post_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='slug',
+            field=models.SlugField(allow_unicode=True, max_length=60, null=True),
+        ),
+        migrations.RunPython(populate_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='tag',
+            name='slug',
+            field=models.SlugField(allow_unicode=True, max_length=60, unique=True),
+        ),
+    ]
@@ -2,6 +2,7 @@
 from django.db import models
 from django.conf import settings
 from django.contrib.auth.models import User  
+from django.utils.text import slugify
 
 class Post(models.Model):
     title = models.CharField(max_length=200)
@@ -10,18 +11,47 @@ class Post(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     tags = models.ManyToManyField('Tag', blank=True, related_name='posts')  # <- NEW
 
+    class Meta:
+        indexes = [
+            # keyset pagination: newest first on (published_date, id)
+            models.Index(fields=['-published_date', '-id'], name='blog_post_published_id_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+def tag_slug(name: str) -> str:
+    """Base URL slug for a tag name; callers add a -N suffix on collision."""
+    return slugify(name, allow_unicode=True)[:50] or "tag"
+
+
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
+    # tag pages are looked up by slug (blog/views.py TagPostListView)
+    slug = models.SlugField(max_length=60, unique=True, allow_unicode=True)
+    # denormalised len(tag.posts), kept current by blog/signals.py
+    post_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            # tag cloud / tag index: most used first
+            models.Index(fields=['-post_count', 'name'], name='blog_tag_count_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            base = slug = tag_slug(self.name)
+            suffix = 1
+            while Tag.objects.filter(slug=slug).exclude(pk=self.pk).exists():
+                suffix += 1
+                slug = f"{base}-{suffix}"
+            self.slug = slug
+        super().save(*args, **kwargs)
+
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments')
@@ -31,6 +61,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['created_at']  # oldest first in the thread
+        indexes = [
+            # a post's thread, page by page (blog.pagination.comments_page)
+            models.Index(fields=['post', 'created_at'], name='blog_comment_post_created_idx'),
+        ]
 
     def __str__(self):
         return f'Comment by {self.author} on {self.post}'
\ No newline at end of file
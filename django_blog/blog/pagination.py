@@ -0,0 +1,138 @@
+# django_blog/blog/pagination.py
+"""
+Keyset ("seek") pagination for post listings.
+
+Posts are ordered newest first on (published_date, id). Instead of
+OFFSET, which makes the database walk every skipped row, a page continues
+from the last row the reader saw:
+
+    ?after=<cursor>   older posts (next page)
+    ?before=<cursor>  newer posts (previous page)
+
+A cursor is "<published_date as epoch microseconds>-<post id>", so every
+page is a range scan on the (published_date, id) index. A cursor that
+doesn't parse, or whose date or id is out of range, is a 404.
+
+Comment threads page the same way, oldest first on (created_at, id), with
+comments_page().
+"""
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Q
+from django.http import Http404
+
+from .models import Comment
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+MIN_MICROS = (datetime(1, 1, 2, tzinfo=timezone.utc) - EPOCH) // MICROSECOND
+MAX_MICROS = (datetime(9999, 12, 30, tzinfo=timezone.utc) - EPOCH) // MICROSECOND
+MAX_PK = 2 ** 63 - 1  # largest id any backend stores
+
+
+def encode_cursor(obj, field="published_date") -> str:
+    micros = (getattr(obj, field) - EPOCH) // MICROSECOND
+    return f"{micros}-{obj.pk}"
+
+
+def decode_cursor(value: str):
+    """(datetime, pk) from a cursor; None if there is none; Http404 if it is malformed."""
+    if not value:
+        return None
+    try:
+        micros, pk = (int(part) for part in value.rsplit("-", 1))  # dates before 1970 are negative
+    except ValueError:
+        raise Http404("Invalid cursor.") from None
+    if not (MIN_MICROS <= micros <= MAX_MICROS and 0 < pk <= MAX_PK):
+        raise Http404("Invalid cursor.")
+    return EPOCH + micros * MICROSECOND, pk
+
+
+class KeysetPage:
+    """The bits of Django's Page the templates use, plus cursors."""
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not (self._has_next and self.object_list):
+            return None
+        return encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not (self._has_previous and self.object_list):
+            return None
+        return encode_cursor(self.object_list[0])
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginationMixin:
+    """
+    Drop-in for ListView pagination: set `paginate_by` as usual and order the
+    queryset however you like; it is re-ordered by (-published_date, -id).
+    Context gets `page_obj` (a KeysetPage) and `is_paginated`.
+    """
+    paginate_by = 10
+
+    def paginate_queryset(self, queryset, page_size):
+        after = decode_cursor(self.request.GET.get("after", ""))
+        before = None if after else decode_cursor(self.request.GET.get("before", ""))
+
+        if before:
+            published, pk = before
+            queryset = queryset.filter(
+                Q(published_date__gt=published) | Q(published_date=published, pk__gt=pk)
+            ).order_by("published_date", "pk")
+        else:
+            if after:
+                published, pk = after
+                queryset = queryset.filter(
+                    Q(published_date__lt=published) | Q(published_date=published, pk__lt=pk)
+                )
+            queryset = queryset.order_by("-published_date", "-pk")
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if before:
+            rows.reverse()
+            page = KeysetPage(rows, has_next=True, has_previous=has_more)
+        else:
+            page = KeysetPage(rows, has_next=has_more, has_previous=bool(after))
+        return None, page, rows, page.has_other_pages()
+
+
+def comments_page(post_id, after="", page_size=20):
+    """
+    One page of a post's comments, oldest first, continuing after the
+    `after` cursor: (comments, next_cursor or None).
+    """
+    queryset = Comment.objects.filter(post_id=post_id)
+    cursor = decode_cursor(after or "")
+    if cursor:
+        created, pk = cursor
+        queryset = queryset.filter(Q(created_at__gt=created) | Q(created_at=created, pk__gt=pk))
+    rows = list(queryset.select_related("author").order_by("created_at", "pk")[:page_size + 1])
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(rows[-1], "created_at")
+    return rows, None
@@ -0,0 +1,208 @@
+# django_blog/blog/search.py
+"""
+Full-text search over posts (title, content and tag names).
+
+SQLite      FTS5 table blog_post_fts(title, content, tags), rowid = post id,
+            ranked with bm25().
+PostgreSQL  table blog_post_search(post_id, document tsvector) with a GIN
+            index, ranked with ts_rank() over a weighted document
+            (title A, tags B, content C).
+
+Both are created by migration 0005 and kept current by blog/signals.py on
+post save/delete and tag changes. Any other backend falls back to the old
+icontains filter, without ranking or snippets.
+
+`search_posts(query)` returns a lazy, sliceable result set that Django's
+Paginator can page through: only the requested page is ranked, fetched
+and highlighted.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Post
+
+# Highlight markers; the snippet is HTML-escaped before they become <mark>
+MARK_START, MARK_END = "⟦", "⟧"
+SNIPPET_WORDS = 24
+
+
+def _tag_names(post) -> str:
+    return " ".join(tag.name for tag in post.tags.all())
+
+
+def _highlight(snippet: str):
+    if not snippet:
+        return ""
+    html = escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+    return mark_safe(html)
+
+
+# ---------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------
+class SQLiteFTSBackend:
+    table = "blog_post_fts"
+
+    @staticmethod
+    def to_match(query: str) -> str:
+        # Every word must match, as a prefix; quoting neutralises FTS syntax
+        words = re.findall(r"\w+", query)
+        return " ".join(f'"{w}"*' for w in words)
+
+    def index(self, post):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [post.pk])
+            cursor.execute(
+                f"INSERT INTO {self.table}(rowid, title, content, tags) VALUES (%s, %s, %s, %s)",
+                [post.pk, post.title, post.content, _tag_names(post)],
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [post_id])
+
+    def count(self, query):
+        match = self.to_match(query)
+        if not match:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {self.table} WHERE {self.table} MATCH %s", [match])
+            return cursor.fetchone()[0]
+
+    def hits(self, query, offset, limit):
+        """[(post_id, snippet)] best first."""
+        match = self.to_match(query)
+        if not match:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, snippet({self.table}, 1, %s, %s, '…', %s) "
+                f"FROM {self.table} WHERE {self.table} MATCH %s "
+                f"ORDER BY bm25({self.table}, 10.0, 1.0, 5.0) LIMIT %s OFFSET %s",
+                [MARK_START, MARK_END, SNIPPET_WORDS, match, limit, offset],
+            )
+            return cursor.fetchall()
+
+
+class PostgresBackend:
+    table = "blog_post_search"
+    document = (
+        "setweight(to_tsvector('english', %s), 'A') || "
+        "setweight(to_tsvector('english', %s), 'B') || "
+        "setweight(to_tsvector('english', %s), 'C')"
+    )
+
+    def index(self, post):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table}(post_id, document) VALUES (%s, {self.document}) "
+                f"ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document",
+                [post.pk, post.title, _tag_names(post), post.content],
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE post_id = %s", [post_id])
+
+    def count(self, query):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT count(*) FROM {self.table} "
+                f"WHERE document @@ websearch_to_tsquery('english', %s)",
+                [query],
+            )
+            return cursor.fetchone()[0]
+
+    def hits(self, query, offset, limit):
+        options = f"StartSel={MARK_START}, StopSel={MARK_END}, MaxWords={SNIPPET_WORDS}, MinWords=8"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT s.post_id, ts_headline('english', p.content, q, %s) "
+                f"FROM {self.table} s JOIN blog_post p ON p.id = s.post_id, "
+                f"websearch_to_tsquery('english', %s) q "
+                f"WHERE s.document @@ q ORDER BY ts_rank(s.document, q) DESC, s.post_id DESC "
+                f"LIMIT %s OFFSET %s",
+                [options, query, limit, offset],
+            )
+            return cursor.fetchall()
+
+
+def get_backend():
+    if connection.vendor == "sqlite":
+        return SQLiteFTSBackend()
+    if connection.vendor == "postgresql":
+        return PostgresBackend()
+    return None
+
+
+def index_post(post):
+    backend = get_backend()
+    if backend is not None:
+        backend.index(post)
+
+
+def remove_post(post_id):
+    backend = get_backend()
+    if backend is not None:
+        backend.remove(post_id)
+
+
+# ---------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------
+class SearchResults:
+    """
+    Sliceable, countable result set for Paginator. Slicing ranks just that
+    window in the index, then loads those posts (with author and tags) and
+    attaches a highlighted `snippet` to each.
+    """
+
+    def __init__(self, query, backend):
+        self.query = query
+        self.backend = backend
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.backend.count(self.query)
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        offset = key.start or 0
+        limit = (key.stop if key.stop is not None else self.count()) - offset
+        hits = self.backend.hits(self.query, offset, limit)
+        posts = Post.objects.select_related("author").prefetch_related("tags").in_bulk(
+            [post_id for post_id, _ in hits]
+        )
+        results = []
+        for post_id, snippet in hits:
+            post = posts.get(post_id)
+            if post is not None:  # deleted between the two queries
+                post.snippet = _highlight(snippet)
+                results.append(post)
+        return results
+
+
+def search_posts(query):
+    """Ranked results for `query`, or a plain queryset on unsupported backends."""
+    backend = get_backend()
+    if backend is not None:
+        return SearchResults(query, backend)
+    return (
+        Post.objects.filter(
+            Q(title__icontains=query) | Q(content__icontains=query) | Q(tags__name__icontains=query)
+        )
+        .select_related("author")
+        .prefetch_related("tags")
+        .order_by("-published_date")
+        .distinct()
+    )
@@ -0,0 +1,155 @@
+# django_blog/blog/signals.py
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import cache, search, tags
+from .models import Comment, Post, Tag
+
+# Cached namespaces (see blog/cache.py) and the models they render.
+POST_LIST_NS = "post_list"
+TAG_CLOUD_NS = "tag_cloud"
+
+
+def post_page_ns(post_id) -> str:
+    """Whole detail page for anonymous readers: post, tags and comments."""
+    return f"post_detail:{post_id}"
+
+
+def post_body_ns(post_id) -> str:
+    """Version of the post body fragment: post fields and tags."""
+    return f"post_body:{post_id}"
+
+
+def invalidate_post(*post_ids, body=True) -> None:
+    for post_id in post_ids:
+        cache.invalidate(post_page_ns(post_id))
+        if body:
+            cache.invalidate(post_body_ns(post_id))
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_post_list(sender, **kwargs):
+    cache.invalidate(POST_LIST_NS)
+
+
+@receiver(post_save, sender=User)
+def invalidate_on_author_change(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which is never rendered.
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+    cache.invalidate(POST_LIST_NS)
+    # their bylines on the detail pages (outside the body fragment)
+    invalidate_post(*Post.objects.filter(author=instance).values_list("pk", flat=True), body=False)
+
+
+# Full-text index (blog/search.py)
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    search.remove_post(instance.pk)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def reindex_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:  # tag.posts.add(...): instance is the Tag
+        posts = Post.objects.filter(pk__in=pk_set) if pk_set else instance.posts.all()
+    else:
+        posts = [instance]
+    for post in posts:
+        search.index_post(post)
+
+
+@receiver(post_save, sender=Tag)
+def reindex_renamed_tag(sender, instance, created, **kwargs):
+    if not created:
+        for post in instance.posts.prefetch_related("tags"):
+            search.index_post(post)
+
+
+# Tag.post_count (blog/tags.py) and the tag cloud built from it
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tag_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and not reverse:
+        # post_clear no longer knows which tags were attached
+        instance._cleared_tag_ids = list(instance.tags.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:  # tag.posts.add(...): only this tag's count moves
+        tag_ids = [instance.pk]
+    elif action == "post_clear":
+        tag_ids = getattr(instance, "_cleared_tag_ids", [])
+    else:
+        tag_ids = pk_set
+    tags.refresh_post_counts(tag_ids)
+    cache.invalidate(TAG_CLOUD_NS)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_post_tags(sender, instance, **kwargs):
+    # Deleting a post drops its M2M rows without sending m2m_changed
+    instance._deleted_tag_ids = list(instance.tags.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Post)
+def release_post_tags(sender, instance, **kwargs):
+    tags.refresh_post_counts(getattr(instance, "_deleted_tag_ids", []))
+    cache.invalidate(TAG_CLOUD_NS)
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_tag_cloud(sender, **kwargs):
+    cache.invalidate(TAG_CLOUD_NS)
+
+
+# Detail page and its fragments (PostDetailView, post_detail.html)
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_detail(sender, instance, **kwargs):
+    invalidate_post(instance.pk)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_tagged_post_detail(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # tag.posts.clear(): post_clear no longer knows which posts had the tag
+        instance._cleared_post_ids = list(instance.posts.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        invalidate_post(instance.pk)
+    elif action == "post_clear":
+        invalidate_post(*getattr(instance, "_cleared_post_ids", []))
+    else:
+        invalidate_post(*pk_set)
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_tagged_posts(sender, instance, **kwargs):
+    instance._tagged_post_ids = list(instance.posts.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Tag)
+def invalidate_renamed_tag_posts(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_post(*instance.posts.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def invalidate_deleted_tag_posts(sender, instance, **kwargs):
+    invalidate_post(*getattr(instance, "_tagged_post_ids", []))
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_post_comments(sender, instance, **kwargs):
+    # The comment fragment is keyed on its own count/timestamp; only the page goes
+    invalidate_post(instance.post_id, body=False)
@@ -1,2 +1,21 @@
 // django_blog/blog/static/blog/js/app.js
 console.log('Blog static JS loaded.');
+
+// "Load more comments": swap the link for the next page of <li> items
+document.addEventListener('click', function (event) {
+  var link = event.target.closest('.comment-list .load-more a');
+  if (!link) return;
+  event.preventDefault();
+  link.textContent = 'Loading…';
+  fetch(link.href, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+    .then(function (response) {
+      if (!response.ok) throw new Error(response.status);
+      return response.text();
+    })
+    .then(function (html) {
+      link.closest('li').outerHTML = html;
+    })
+    .catch(function () {
+      link.textContent = 'Load more comments';
+    });
+});
@@ -0,0 +1,72 @@
+# django_blog/blog/tags.py
+"""
+Tag resolution for the post create/update forms.
+
+Turns the comma-separated `tags_input` into Tag rows in a constant number
+of queries, whatever the number of tags:
+
+    1. one `name__in` lookup for the tags that already exist,
+    2. one bulk INSERT ... ON CONFLICT DO NOTHING for the missing ones
+       (a concurrent save creating the same tag is simply ignored),
+    3. one `name__in` lookup to pick up the rows just created.
+
+New tags get their slug here too. A name whose slug is already taken
+("c++" after "c#") is skipped by the bulk insert and falls back to
+Tag.save(), which picks a free "<slug>-N".
+
+Names are normalised (trimmed, lower-cased, de-duplicated) so "Django" and
+"django " resolve to the same tag and `name__in` can use the unique index.
+
+It also keeps Tag.post_count current (see refresh_post_counts), which the
+tag cloud and tag index read instead of a Count() over the M2M table.
+"""
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Post, Tag, tag_slug
+
+
+def normalize_tag_name(name: str) -> str:
+    return " ".join(name.split()).lower()
+
+
+def parse_tag_names(raw: str) -> list:
+    """'Django, ALX ,django' -> ['django', 'alx'] (first-seen order)."""
+    names = (normalize_tag_name(part) for part in (raw or "").split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def resolve_tags(names) -> list:
+    """Return Tag objects for `names` (already normalised), creating missing ones."""
+    if not names:
+        return []
+    found = {tag.name: tag for tag in Tag.objects.filter(name__in=names)}
+    missing = [name for name in names if name not in found]
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(name=name, slug=tag_slug(name)) for name in missing], ignore_conflicts=True
+        )
+        found.update((tag.name, tag) for tag in Tag.objects.filter(name__in=missing))
+        for name in missing:
+            if name not in found:  # slug clash
+                found[name] = Tag.objects.get_or_create(name=name)[0]
+    return [found[name] for name in names if name in found]
+
+
+def save_post_tags(post, raw: str) -> None:
+    post.tags.set(resolve_tags(parse_tag_names(raw)))
+
+
+def refresh_post_counts(tag_ids) -> None:
+    """Recount Tag.post_count for `tag_ids` in a single UPDATE."""
+    tag_ids = list(tag_ids)
+    if not tag_ids:
+        return
+    counts = (
+        Post.tags.through.objects.filter(tag_id=OuterRef("pk"))
+        .order_by()
+        .values("tag_id")
+        .annotate(n=Count("*"))
+        .values("n")
+    )
+    Tag.objects.filter(pk__in=tag_ids).update(post_count=Coalesce(Subquery(counts), 0))
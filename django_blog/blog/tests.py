@@ -1,3 +1,405 @@
-from django.test import TestCase
+from datetime import datetime, timezone
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from . import cache as response_cache
+from .context_processors import tag_cloud_entries
+from .models import Comment, Post, Tag
+
+
+class PostListViewTests(TestCase):
+    def setUp(self):
+        cache.clear()  # the anonymous response cache would hide the queries
+        self.author = User.objects.create_user(username="writer", password="pass1234")
+        self.django_tag = Tag.objects.create(name="django")
+        self.python_tag = Tag.objects.create(name="python")
+
+    def make_posts(self, count):
+        for i in range(count):
+            post = Post.objects.create(title=f"Post {i}", content="Body", author=self.author)
+            post.tags.set([self.django_tag, self.python_tag])
+
+    def test_query_count_does_not_grow_with_posts(self):
+        # 1 query for the page of posts (+ author), 1 for their tags;
+        # the tag cloud comes from the (warm) cache
+        self.make_posts(3)
+        tag_cloud_entries()
+        with self.assertNumQueries(2):
+            self.client.get(reverse("blog:post_list"))
+        cache.clear()
+        self.make_posts(12)
+        tag_cloud_entries()
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("blog:post_list"))
+        self.assertEqual(len(response.context["posts"]), 10)
+
+    def test_tag_listing_query_count(self):
+        self.make_posts(12)
+        tag_cloud_entries()
+        # the tag by slug, its page of posts (+ author), their tags
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("blog:posts_by_tag", args=["django"]))
+        self.assertEqual(len(response.context["posts"]), 10)
+
+    def test_tag_pages_use_slugs(self):
+        tag = Tag.objects.create(name="c++")
+        Post.objects.create(title="Pointers", content="Body", author=self.author).tags.add(tag)
+        self.assertEqual(tag.slug, "c")
+        response = self.client.get(reverse("blog:posts_by_tag", args=["c"]))
+        self.assertEqual([p.title for p in response.context["posts"]], ["Pointers"])
+        self.assertRedirects(
+            self.client.get("/tags/C++/"), reverse("blog:posts_by_tag", args=["c"]), status_code=301
+        )
+        self.assertEqual(self.client.get("/tags/nope/").status_code, 404)
+
+    def test_keyset_navigation_walks_every_post_once(self):
+        self.make_posts(25)
+        seen, url = [], reverse("blog:post_list")
+        response = self.client.get(url)
+        while True:
+            page = response.context["page_obj"]
+            seen.extend(p.pk for p in page)
+            if not page.has_next():
+                break
+            response = self.client.get(url, {"after": page.next_cursor})
+        expected = list(Post.objects.order_by("-published_date", "-pk").values_list("pk", flat=True))
+        self.assertEqual(seen, expected)
+
+        previous = self.client.get(url, {"before": page.previous_cursor}).context["page_obj"]
+        self.assertEqual([p.pk for p in previous], expected[10:20])
+
+    def test_malformed_cursors_are_404(self):
+        self.make_posts(3)
+        url = reverse("blog:post_list")
+        for cursor in ["nope", "1", "1-x", "99999999999999999999999-1", "0-99999999999999999999", "5-0"]:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get(url, {"after": cursor}).status_code, 404)
+                self.assertEqual(self.client.get(url, {"before": cursor}).status_code, 404)
+        comments_url = reverse("blog:comment_page", args=[Post.objects.first().pk])
+        self.assertEqual(self.client.get(comments_url, {"after": "-99999999999999999999-1"}).status_code, 404)
+
+    def test_cursors_before_1970_round_trip(self):
+        self.make_posts(12)
+        for i, post in enumerate(Post.objects.all()):
+            Post.objects.filter(pk=post.pk).update(published_date=datetime(1960, 1, 1 + i, tzinfo=timezone.utc))
+        url = reverse("blog:post_list")
+        page = self.client.get(url).context["page_obj"]
+        self.assertTrue(page.next_cursor.startswith("-"))
+        rest = self.client.get(url, {"after": page.next_cursor}).context["page_obj"]
+        expected = list(Post.objects.order_by("-published_date", "-pk").values_list("pk", flat=True))
+        self.assertEqual([p.pk for p in page] + [p.pk for p in rest], expected)
+
+
+class PostSearchTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="writer", password="pass1234")
+        self.url = reverse("blog:post_search")
+
+    def search(self, q, **params):
+        return self.client.get(self.url, {"q": q, **params}).context
+
+    def test_ranks_title_matches_first_and_highlights(self):
+        Post.objects.create(title="Cooking", content="A note on django in the kitchen", author=self.author)
+        Post.objects.create(title="Django tips", content="Views, models and <b>templates</b>", author=self.author)
+        posts = list(self.search("django")["posts"])
+        self.assertEqual([p.title for p in posts], ["Django tips", "Cooking"])
+        self.assertIn("<mark>django</mark>", posts[1].snippet)
+        # content is escaped; only the highlight markup is raw HTML
+        self.assertIn("&lt;b&gt;", posts[0].snippet)
+
+    def test_index_follows_edits_tags_and_deletes(self):
+        post = Post.objects.create(title="Untitled", content="Nothing yet", author=self.author)
+        self.assertEqual(len(self.search("orm")["posts"]), 0)
+
+        post.tags.add(Tag.objects.create(name="orm"))
+        self.assertEqual([p.pk for p in self.search("orm")["posts"]], [post.pk])
+
+        post.title = "Querysets"
+        post.save()
+        self.assertEqual(len(self.search("querysets")["posts"]), 1)
+
+        post.delete()
+        self.assertEqual(len(self.search("querysets")["posts"]), 0)
+
+    def test_results_are_paginated(self):
+        for i in range(12):
+            Post.objects.create(title=f"Python {i}", content="python", author=self.author)
+        ctx = self.search("python", page=2)
+        self.assertEqual(ctx["paginator"].count, 12)
+        self.assertEqual(len(ctx["posts"]), 2)
+
+
+class TagResolutionTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="writer", password="pass1234")
+        self.client.login(username="writer", password="pass1234")
+        Tag.objects.create(name="django")
+
+    def create_post(self, tags_input):
+        self.client.post(reverse("blog:post_create"), {"title": "T", "content": "C", "tags_input": tags_input})
+        return Post.objects.latest("pk")
+
+    def test_new_tags_get_unique_slugs(self):
+        post = self.create_post("Machine Learning, c#, c++")
+        self.assertEqual(
+            sorted(post.tags.values_list("slug", flat=True)), ["c", "c-2", "machine-learning"]
+        )
+
+    def test_names_are_normalised_and_reused(self):
+        post = self.create_post("Django,  python , PYTHON,,")
+        self.assertEqual(sorted(t.name for t in post.tags.all()), ["django", "python"])
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_query_count_does_not_grow_with_tags(self):
+        from .tags import resolve_tags
+
+        with self.assertNumQueries(3):  # lookup, bulk insert, re-fetch
+            tags = resolve_tags([f"tag{i}" for i in range(3)] + ["django"])
+        self.assertEqual(len(tags), 4)
+        with self.assertNumQueries(3):
+            tags = resolve_tags([f"new{i}" for i in range(30)] + ["tag0"])
+        self.assertEqual(len(tags), 31)
+        with self.assertNumQueries(1):
+            resolve_tags(["tag1", "new2"])
+
+    def test_update_form_uses_prefetched_tags(self):
+        post = self.create_post("django, orm")
+        response = self.client.get(reverse("blog:post_update", args=[post.pk]))
+        self.assertEqual(response.context["form"]["tags_input"].initial, "django, orm")
+
+
+class TagCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="writer", password="pass1234")
+        self.django_tag = Tag.objects.create(name="django")
+        self.python_tag = Tag.objects.create(name="python")
+
+    def counts(self):
+        return dict(Tag.objects.values_list("name", "post_count"))
+
+    def test_post_count_follows_m2m_changes_and_deletes(self):
+        first = Post.objects.create(title="A", content="C", author=self.author)
+        second = Post.objects.create(title="B", content="C", author=self.author)
+        first.tags.set([self.django_tag, self.python_tag])
+        second.tags.add(self.django_tag)
+        self.assertEqual(self.counts(), {"django": 2, "python": 1})
+
+        first.tags.remove(self.python_tag)
+        self.python_tag.posts.add(second)
+        self.assertEqual(self.counts(), {"django": 2, "python": 1})
+
+        second.tags.clear()
+        self.assertEqual(self.counts(), {"django": 1, "python": 0})
+
+        first.delete()
+        self.assertEqual(self.counts(), {"django": 0, "python": 0})
+
+    def test_tag_cloud_is_cached_and_invalidated(self):
+        post = Post.objects.create(title="A", content="C", author=self.author)
+        post.tags.add(self.django_tag)
+        self.assertEqual([t["name"] for t in tag_cloud_entries()], ["django"])
+        with self.assertNumQueries(0):
+            tag_cloud_entries()
+
+        post.tags.add(self.python_tag)
+        self.assertEqual([t["name"] for t in tag_cloud_entries()], ["django", "python"])
+
+    def test_tag_index_lists_tags_by_use(self):
+        for i in range(2):
+            Post.objects.create(title=f"P{i}", content="C", author=self.author).tags.add(self.python_tag)
+        Post.objects.create(title="D", content="C", author=self.author).tags.add(self.django_tag)
+        response = self.client.get(reverse("blog:tag_index"))
+        self.assertEqual([t.name for t in response.context["tags"]], ["python", "django"])
+        self.assertContains(response, 'title="2 posts">python</a>')
+
+
+class PostDetailCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="writer", password="pass1234")
+        self.post = Post.objects.create(title="Cached", content="First body", author=self.author)
+        self.post.tags.add(Tag.objects.create(name="django"))
+        self.url = reverse("blog:post_detail", args=[self.post.pk])
+        tag_cloud_entries()
+
+    def test_anonymous_page_is_cached_until_post_or_comment_changes(self):
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+
+        self.post.comments.create(author=self.author, content="Nice one")
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertContains(response, "Nice one")
+
+        self.post.content = "Second body"
+        self.post.save()
+        self.assertContains(self.client.get(self.url), "Second body")
+
+    def test_fragments_skip_body_and_comment_queries(self):
+        self.post.comments.create(author=self.author, content="Hello")
+        self.client.login(username="writer", password="pass1234")
+        self.client.get(self.url)
+        # session + user + the post (with its comment count/timestamp)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertContains(response, "Hello")
+        self.assertContains(response, "First body")
+
+        self.post.tags.add(Tag.objects.create(name="orm"))
+        self.assertContains(self.client.get(self.url), "/tags/orm/")
+
+        self.post.comments.get().delete()
+        self.assertContains(self.client.get(self.url), "No comments yet.")
+
+    def test_author_rename_shows_up_on_the_page(self):
+        self.assertContains(self.client.get(self.url), ">writer</a>")
+        self.author.username = "novelist"
+        self.author.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertContains(response, ">novelist</a>")
+        self.assertContains(response, "First body")
+
+
+class ResponseCacheGenerationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="writer", password="pass1234")
+        self.url = reverse("blog:post_list")
+        tag_cloud_entries()
+
+    def test_invalidate_bumps_generation_and_key(self):
+        request = RequestFactory().get(self.url, {"b": "2", "a": "1"})
+        generation = response_cache.get_generation("post_list")
+        key = response_cache.build_key("post_list", request)
+        response_cache.invalidate("post_list")
+        self.assertEqual(response_cache.get_generation("post_list"), generation + 1)
+        self.assertNotEqual(response_cache.build_key("post_list", request), key)
+        # other namespaces keep theirs
+        self.assertEqual(response_cache.get_generation("tag_cloud"), 1)
+
+    def test_post_change_turns_cached_list_into_a_miss(self):
+        Post.objects.create(title="First", content="Body", author=self.author)
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+
+        response_cache.invalidate("tag_cloud")
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+
+        Post.objects.create(title="Second", content="Body", author=self.author)
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertContains(response, "Second")
+        self.assertEqual(response_cache.stats("post_list")["post_list"], {"hits": 2, "misses": 2})
+
+
+@override_settings(COMMENTS_PAGE_SIZE=5)
+class CommentPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="writer", password="pass1234")
+        self.post = Post.objects.create(title="Busy", content="Body", author=self.author)
+        Comment.objects.bulk_create(
+            [Comment(post=self.post, author=self.author, content=f"comment #{i}") for i in range(12)]
+        )
+        tag_cloud_entries()
+
+    def test_detail_renders_first_page_only(self):
+        # post (+ count), tags, first page of comments
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("blog:post_detail", args=[self.post.pk]))
+        self.assertContains(response, "Comments (12)")
+        self.assertContains(response, "comment #4")
+        self.assertNotContains(response, "comment #5")
+        self.assertContains(response, "Load more comments")
+
+    def test_load_more_walks_the_thread(self):
+        seen, url = [], reverse("blog:comment_page", args=[self.post.pk])
+        response = self.client.get(url)
+        while True:
+            seen.extend(c.content for c in response.context["comments"])
+            cursor = response.context["next_cursor"]
+            if not cursor:
+                break
+            response = self.client.get(url, {"after": cursor})
+        self.assertEqual(seen, [f"comment #{i}" for i in range(12)])
+        self.assertNotContains(response, "Load more comments")
+
+    def test_load_more_for_missing_post_is_404(self):
+        self.assertEqual(self.client.get(reverse("blog:comment_page", args=[999])).status_code, 404)
+
+
+@override_settings(FEED_ITEMS=3)
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="writer", password="pass1234")
+        self.tag = Tag.objects.create(name="django")
+        for i in range(5):
+            Post.objects.create(title=f"Post {i}", content="Body", author=self.author)
+        Post.objects.get(title="Post 1").tags.add(self.tag)
+
+    def test_feeds_list_latest_entries(self):
+        rss = self.client.get(reverse("blog:post_feed_rss"))
+        self.assertEqual(rss.content.count(b"<item>"), 3)
+        self.assertContains(rss, "<title>Post 4</title>")
+        self.assertNotContains(rss, "<title>Post 1</title>")
+
+        atom = self.client.get(reverse("blog:tag_feed_atom", args=["django"]))
+        self.assertEqual(atom.content.count(b"<entry>"), 1)
+        self.assertContains(atom, "<title>Post 1</title>")
+        self.assertEqual(self.client.get(reverse("blog:tag_feed_rss", args=["nope"])).status_code, 404)
+
+    def test_unchanged_feed_is_not_modified(self):
+        url = reverse("blog:post_feed_atom")
+        first = self.client.get(url)
+        self.assertTrue(first.has_header("Last-Modified"))
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        Post.objects.filter(title="Post 4").get().save()  # an edit keeps published_date
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 200)
+
+
+class StaticMinifyTests(TestCase):
+    def test_css_minifier_keeps_selectors_intact(self):
+        from .storage import minify_css
+
+        css = "/* c */\na :hover , b > i { color : red ; }\n@media (max-width: 600px) { .x { margin : 0 ; } }\n"
+        self.assertEqual(minify_css(css), "a :hover,b>i{color:red}@media (max-width: 600px){.x{margin:0}}")
+
+
+@override_settings(AUTHOR_LATEST_POSTS=2)
+class AuthorPageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        tag_cloud_entries()
+        self.writers = [User.objects.create_user(username=f"writer{i}", password="pass1234") for i in range(3)]
+        for n, writer in enumerate(self.writers, start=1):
+            for i in range(n + 1):
+                post = Post.objects.create(title=f"{writer.username} #{i}", content="Body", author=writer)
+                Comment.objects.create(post=post, author=self.writers[0], content="Hi")
+        User.objects.create_user(username="lurker", password="pass1234")
+
+    def test_listing_query_count_is_constant(self):
+        # paginator count, authors with their stats, everybody's latest posts
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("blog:author_list"))
+        authors = response.context["authors"]
+        self.assertEqual([a.username for a in authors], ["writer2", "writer1", "writer0"])
+        self.assertEqual([a.post_count for a in authors], [4, 3, 2])
+        self.assertEqual(authors[2].comment_count, 9)
+        self.assertEqual([p.title for p in authors[0].latest_posts], ["writer2 #3", "writer2 #2"])
+
+    def test_author_page(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("blog:author_detail", args=["writer1"]))
+        self.assertEqual(response.context["author"].post_count, 3)
+        self.assertEqual(len(response.context["author"].latest_posts), 2)
+        self.assertEqual(self.client.get(reverse("blog:author_detail", args=["nobody"])).status_code, 404)
@@ -3,8 +3,11 @@ from django.contrib.auth import views as auth_views
 from .views import (
     PostListView, PostDetailView,
     PostCreateView, PostUpdateView, PostDeleteView,
-    register_view, profile_view, CommentCreateView, CommentUpdateView, CommentDeleteView,
-    TagPostListView, PostSearchView, PostByTagListView,
+    register_view, profile_view, CommentPageView, CommentCreateView, CommentUpdateView, CommentDeleteView,
+    TagPostListView, PostSearchView, TagIndexView, AuthorListView, AuthorDetailView,
+)
+from .feeds import (
+    LatestPostsFeed, LatestPostsAtomFeed, TagPostsFeed, TagPostsAtomFeed, conditional,
 )
 
 app_name = 'blog'
@@ -24,13 +27,22 @@ urlpatterns = [
     path('post/<int:pk>/update/',    PostUpdateView.as_view(),   name='post_update'),
     path('post/<int:pk>/delete/',    PostDeleteView.as_view(),   name='post_delete'),
     # Comments
+    path('post/<int:pk>/comments/', CommentPageView.as_view(), name='comment_page'),
     path('post/<int:pk>/comments/new/', CommentCreateView.as_view(), name='comment_create'),
     path('comment/<int:pk>/update/', CommentUpdateView.as_view(), name='comment_update'),
     path('comment/<int:pk>/delete/', CommentDeleteView.as_view(), name='comment_delete'),
         #Tag + Search
-    path('tags/<str:tag_name>/', TagPostListView.as_view(), name='posts_by_tag'),
+    path('tags/', TagIndexView.as_view(), name='tag_index'),
+    path('tags/<str:slug>/', TagPostListView.as_view(), name='posts_by_tag'),
+    # Feeds
+    path('feeds/rss/',               conditional(LatestPostsFeed()),     name='post_feed_rss'),
+    path('feeds/atom/',              conditional(LatestPostsAtomFeed()), name='post_feed_atom'),
+    path('tags/<str:slug>/rss/',     conditional(TagPostsFeed()),        name='tag_feed_rss'),
+    path('tags/<str:slug>/atom/',    conditional(TagPostsAtomFeed()),    name='tag_feed_atom'),
     path('search/', PostSearchView.as_view(), name='post_search'),
-    path('tags/<slug:tag_slug>/', PostByTagListView.as_view(), name='posts_by_tag'),
+    # Authors
+    path('authors/',                 AuthorListView.as_view(),   name='author_list'),
+    path('authors/<str:username>/',  AuthorDetailView.as_view(), name='author_detail'),
 
 ]
 
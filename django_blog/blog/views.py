@@ -1,11 +1,20 @@
 from django.urls import reverse, reverse_lazy
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+from django.views.generic import View, ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Q
+from django.conf import settings
+from django.http import Http404
+from functools import partial
+from django.contrib.auth.models import User
+from django.db.models import Count, IntegerField, Max, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from . import cache, search
+from .signals import post_body_ns, post_page_ns
+from .tags import normalize_tag_name, save_post_tags
 from .models import Post, Comment, Tag
+from .pagination import KeysetPaginationMixin, comments_page
 from .forms import RegisterForm, ProfileForm, PostForm, CommentForm
 
 def register_view(request):
@@ -35,11 +44,16 @@ def profile_view(request):
         form = ProfileForm(instance=request.user)
 
     return render(request, 'blog/profile.html', {"form": form})
-class PostListView(ListView):
+class PostListView(cache.AnonymousResponseCacheMixin, KeysetPaginationMixin, ListView):
     model = Post
+    cache_namespace = "post_list"
     template_name = "blog/post_list.html"
     context_object_name = "posts"
 
+    def get_queryset(self):
+        # author + tags in two queries per page, whatever the page size
+        return Post.objects.select_related("author").prefetch_related("tags")
+
 
 class PostCreateView(LoginRequiredMixin, CreateView):
     model = Post
@@ -49,15 +63,9 @@ class PostCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         form.instance.author = self.request.user
         resp = super().form_valid(form)     # self.object now exists
-        self._save_tags(form)               # attach tags
+        save_post_tags(self.object, form.cleaned_data.get("tags_input", ""))
         return resp
 
-    def _save_tags(self, form):
-        raw = form.cleaned_data.get("tags_input", "")
-        names = [n.strip() for n in raw.split(",") if n.strip()]
-        tag_objs = [Tag.objects.get_or_create(name=name)[0] for name in names]
-        self.object.tags.set(tag_objs)
-
     def get_success_url(self):
         return reverse("blog:post_detail", kwargs={"pk": self.object.pk})
 
@@ -66,20 +74,24 @@ class PostUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     form_class = PostForm
     template_name = "blog/post_form.html"
 
+    def get_queryset(self):
+        # PostForm reads the current tags from the prefetch cache
+        return Post.objects.prefetch_related("tags")
+
+    def get_object(self, queryset=None):
+        # test_func and get()/post() both ask for the object; load it once
+        if not hasattr(self, "_post"):
+            self._post = super().get_object(queryset)
+        return self._post
+
     def test_func(self):
         return self.get_object().author == self.request.user
 
     def form_valid(self, form):
         resp = super().form_valid(form)
-        self._save_tags(form)
+        save_post_tags(self.object, form.cleaned_data.get("tags_input", ""))
         return resp
 
-    def _save_tags(self, form):
-        raw = form.cleaned_data.get("tags_input", "")
-        names = [n.strip() for n in raw.split(",") if n.strip()]
-        tag_objs = [Tag.objects.get_or_create(name=name)[0] for name in names]
-        self.object.tags.set(tag_objs)
-
     def get_success_url(self):
         return reverse("blog:post_detail", kwargs={"pk": self.object.pk})
 
@@ -92,17 +104,66 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return self.get_object().author == self.request.user
     
 
-class PostDetailView(DetailView):
+def comments_page_size() -> int:
+    return getattr(settings, "COMMENTS_PAGE_SIZE", 20)
+
+
+class PostDetailView(cache.AnonymousResponseCacheMixin, DetailView):
+    """
+    Anonymous readers get the whole page from the response cache, one
+    namespace per post. Everyone else gets the post body and the comment
+    list from versioned template fragments: the body is keyed on a per-post
+    generation bumped by blog/signals.py on post and tag changes, the
+    comments on their count and latest timestamp. A warm hit costs the one
+    query that loads the post.
+    """
     model = Post
     template_name = "blog/post_detail.html"
     context_object_name = "post"
 
+    def get_cache_namespace(self):
+        return post_page_ns(self.kwargs["pk"])
+
+    def get_queryset(self):
+        return Post.objects.select_related("author").annotate(
+            comments_count=Count("comments"),
+            comments_latest=Max("comments__updated_at"),
+        )
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx["comments"] = self.object.comments.select_related("author").all()
+        post = self.object
+        latest = post.comments_latest.timestamp() if post.comments_latest else 0
+        # Both are only evaluated when their fragment is re-rendered: the
+        # first page of comments, and the tags inside the body fragment
+        ctx["comment_page"] = partial(comments_page, post.pk, page_size=comments_page_size())
+        ctx["body_version"] = cache.get_generation(post_body_ns(post.pk))
+        ctx["comments_version"] = f"{post.comments_count}-{latest}"
+        ctx["fragment_ttl"] = getattr(settings, "FRAGMENT_CACHE_TTL", 3600)
         ctx["comment_form"] = CommentForm()
         return ctx
 
+
+class CommentPageView(cache.AnonymousResponseCacheMixin, View):
+    """
+    "Load more" for a post's comments: the next page after ?after=<cursor>,
+    as an HTML fragment of <li> items (blog/_comment_items.html). Cached for
+    anonymous readers alongside the post's detail page.
+    """
+
+    def get_cache_namespace(self):
+        return post_page_ns(self.kwargs["pk"])
+
+    def get(self, request, pk):
+        comments, next_cursor = comments_page(pk, request.GET.get("after", ""), comments_page_size())
+        if not comments and not Post.objects.filter(pk=pk).exists():
+            raise Http404("No such post.")
+        return render(request, "blog/_comment_items.html", {
+            "post_id": pk,
+            "comments": comments,
+            "next_cursor": next_cursor,
+        })
+
 class CommentCreateView(LoginRequiredMixin, CreateView):
     model = Comment
     form_class = CommentForm
@@ -148,42 +209,52 @@ class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return reverse("blog:post_detail", kwargs={"pk": self.object.post.pk})
 
 
-# --- NEW: filter posts by tag ---
-class TagPostListView(ListView):
+class TagPostListView(KeysetPaginationMixin, ListView):
+    """
+    Posts with one tag. The tag is found by its unique slug, then its posts
+    come through the M2M (tag_id) index. Old name-based links redirect to
+    the slug URL.
+    """
     model = Post
     template_name = "blog/post_list.html"
     context_object_name = "posts"
 
+    def get(self, request, *args, **kwargs):
+        slug = self.kwargs["slug"]
+        self.tag = Tag.objects.filter(slug=slug).first()
+        if self.tag is None:
+            tag = get_object_or_404(Tag, name=normalize_tag_name(slug))
+            return redirect("blog:posts_by_tag", tag.slug, permanent=True)
+        return super().get(request, *args, **kwargs)
+
     def get_queryset(self):
-        tag_name = self.kwargs["tag_name"]
-        return (
-            Post.objects.filter(tags__name__iexact=tag_name)
-            .select_related("author")
-            .order_by("-published_date")
-            .distinct()
-        )
+        return self.tag.posts.select_related("author").prefetch_related("tags")
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx["current_tag"] = self.kwargs["tag_name"]
+        ctx["current_tag"] = self.tag.name
         return ctx
 
 # --- NEW: search posts by title/content/tags ---
 class PostSearchView(ListView):
+    """
+    Ranked full-text search (see blog/search.py), 10 results per page with
+    highlighted snippets. Without a query it lists every post, newest first.
+    """
     model = Post
     template_name = "blog/search_results.html"
     context_object_name = "posts"
+    paginate_by = 10
 
     def get_queryset(self):
         q = (self.request.GET.get("q") or "").strip()
-        qs = Post.objects.all()
         if q:
-            qs = qs.filter(
-                Q(title__icontains=q) |
-                Q(content__icontains=q) |
-                Q(tags__name__icontains=q)
-            ).distinct()
-        return qs.order_by("-published_date")
+            return search.search_posts(q)
+        return (
+            Post.objects.select_related("author")
+            .prefetch_related("tags")
+            .order_by("-published_date", "-pk")
+        )
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -191,22 +262,71 @@ class PostSearchView(ListView):
         return ctx
     
 
-class PostByTagListView(ListView):
-    model = Post
-    template_name = "blog/post_list.html"
-    context_object_name = "posts"
+class TagIndexView(cache.AnonymousResponseCacheMixin, ListView):
+    """Every tag in use, most used first, read from the precomputed Tag.post_count."""
+    cache_namespace = "tag_cloud"
+    model = Tag
+    template_name = "blog/tag_index.html"
+    context_object_name = "tags"
+    paginate_by = 50
 
     def get_queryset(self):
-        tag_slug = self.kwargs["tag_slug"]
-        # simple case-insensitive match on tag name; works for plain slugs like "django"
-        return (
-            Post.objects.filter(tags__name__iexact=tag_slug)
-            .select_related("author")
-            .order_by("-published_date")
-            .distinct()
+        return Tag.objects.filter(post_count__gt=0).order_by("-post_count", "name")
+
+
+# --- Authors ---
+def _count_by_author(model):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(author=OuterRef("pk"))
+            .order_by()
+            .values("author")
+            .annotate(n=Count("pk"))
+            .values("n"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def authors_with_stats():
+    """
+    Users annotated with post_count, comment_count and last_published, with
+    `latest_posts` holding their AUTHOR_LATEST_POSTS newest posts. One query
+    for the users and their stats, one for everybody's latest posts (a
+    sliced prefetch, i.e. a ROW_NUMBER() window per author).
+    """
+    latest = getattr(settings, "AUTHOR_LATEST_POSTS", 5)
+    return User.objects.annotate(
+        post_count=_count_by_author(Post),
+        comment_count=_count_by_author(Comment),
+        last_published=Subquery(
+            Post.objects.filter(author=OuterRef("pk")).order_by("-published_date").values("published_date")[:1]
+        ),
+    ).prefetch_related(
+        Prefetch(
+            "post_set",
+            queryset=Post.objects.order_by("-published_date", "-pk")[:latest],
+            to_attr="latest_posts",
         )
+    )
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        ctx["current_tag"] = self.kwargs["tag_slug"]
-        return ctx
\ No newline at end of file
+
+class AuthorListView(ListView):
+    """Everyone who has published, most prolific first."""
+    template_name = "blog/author_list.html"
+    context_object_name = "authors"
+    paginate_by = 20
+
+    def get_queryset(self):
+        return authors_with_stats().filter(post_count__gt=0).order_by("-post_count", "username")
+
+
+class AuthorDetailView(DetailView):
+    template_name = "blog/author_detail.html"
+    context_object_name = "author"
+    slug_field = "username"
+    slug_url_kwarg = "username"
+
+    def get_queryset(self):
+        return authors_with_stats()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from django.utils.translation import gettext_lazy as _ 
 
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -65,6 +67,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "blog.context_processors.tag_cloud",
             ],
         },
     },
@@ -125,12 +128,67 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# Outside DEBUG (or with STATIC_PIPELINE=1), `collectstatic` minifies,
+# fingerprints and pre-compresses (gzip/brotli) the assets (blog/storage.py)
+# and WhiteNoise serves the hashed names with an immutable, far-future
+# Cache-Control. Development and tests keep the plain storage, which needs
+# no collectstatic run.
+STATIC_PIPELINE = os.getenv("STATIC_PIPELINE", "0" if DEBUG else "1") == "1"
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": (
+            "blog.storage.MinifiedCompressedManifestStorage" if STATIC_PIPELINE
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
+# Unhashed files may change at any time
+WHITENOISE_MAX_AGE = int(os.getenv("WHITENOISE_MAX_AGE", "3600"))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# Local memory per process by default; set REDIS_URL to share the cache
+# (and its invalidations) between workers.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "django-blog",
+    }
+}
+if os.getenv("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+    }
+
+# Anonymous response cache for the post index (blog/cache.py)
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+
+# {% cache %} fragments of the post detail page; versioned, so the TTL only
+# bounds how long superseded versions linger
+FRAGMENT_CACHE_TTL = int(os.getenv("FRAGMENT_CACHE_TTL", "3600"))
+
+# Comments rendered with a post; the rest load page by page ("load more")
+COMMENTS_PAGE_SIZE = int(os.getenv("COMMENTS_PAGE_SIZE", "20"))
+
+# Entries per RSS/Atom feed (blog/feeds.py)
+FEED_ITEMS = int(os.getenv("FEED_ITEMS", "20"))
+
+# Newest posts listed per author on the author pages
+AUTHOR_LATEST_POSTS = int(os.getenv("AUTHOR_LATEST_POSTS", "5"))
+
+# Tag cloud shown on every page (blog/context_processors.py)
+TAG_CLOUD_SIZE = int(os.getenv("TAG_CLOUD_SIZE", "20"))
+TAG_CLOUD_TTL = int(os.getenv("TAG_CLOUD_TTL", "3600"))
+
 LOGIN_URL = 'blog:login'             
 LOGIN_REDIRECT_URL = 'blog:post_list'  
 LOGOUT_REDIRECT_URL = 'blog:login'  
\ No newline at end of file
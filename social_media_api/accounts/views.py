@@ -25,6 +25,7 @@ class LoginView(generics.GenericAPIView):
     """
     serializer_class = LoginSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_scope = "login"
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -55,6 +56,7 @@ class FollowUserView(APIView):
     Auth: Token
     """
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "follow"
 
     def post(self, request, user_id: int):
         target = get_object_or_404(User, pk=user_id)
@@ -83,6 +85,7 @@ class UnfollowUserView(APIView):
     Auth: Token
     """
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "follow"
 
     def post(self, request, user_id: int):
         target = get_object_or_404(User, pk=user_id)
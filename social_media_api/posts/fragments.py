@@ -0,0 +1,34 @@
+"""
+PostSerializer fragments.
+
+The part of a serialized post that only changes with the post itself (id,
+title, content, timestamps) is cached per (post id, updated_at). Any edit
+bumps updated_at and therefore the key, so there is nothing to invalidate;
+stale versions age out through POST_FRAGMENT_TTL. The author is left out:
+renaming a user doesn't change the posts' updated_at.
+
+Stored in the response cache's alias (posts/cache.py).
+"""
+from django.conf import settings
+
+from .cache import get_cache
+
+FRAGMENT_PREFIX = "postfrag"
+
+
+def fragment_ttl() -> int:
+    return getattr(settings, "POST_FRAGMENT_TTL", 300)
+
+
+def post_fragment_key(post) -> str:
+    return f"{FRAGMENT_PREFIX}:{post.pk}:{post.updated_at.timestamp()}"
+
+
+def get_post_fragments(posts) -> dict:
+    """Fetch the fragments of a whole page of posts in one round trip."""
+    return get_cache().get_many([post_fragment_key(p) for p in posts])
+
+
+def set_post_fragments(fragments: dict) -> None:
+    if fragments:
+        get_cache().set_many(fragments, fragment_ttl())
@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from . import fragments
 from .models import Post, Comment, Like
 
 User = get_user_model()
@@ -30,14 +31,40 @@ class CommentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class PostListSerializer(serializers.ListSerializer):
+    """
+    Multi-gets the cached fragments of the whole page before serializing
+    each post, then stores the ones that were missing in one go.
+    """
+
+    def to_representation(self, data):
+        posts = list(data.all() if hasattr(data, "all") else data)
+        self.child._fragments = fragments.get_post_fragments(posts)
+        self.child._missing_fragments = {}
+        try:
+            return [self.child.to_representation(post) for post in posts]
+        finally:
+            fragments.set_post_fragments(self.child._missing_fragments)
+            self.child._fragments = None
+            self.child._missing_fragments = None
+
+
 class PostSerializer(serializers.ModelSerializer):
     author = UserBriefSerializer(read_only=True)
     comments_count = serializers.IntegerField(read_only=True)
     likes_count = serializers.IntegerField(read_only=True)
     liked = serializers.SerializerMethodField()
 
+    # User-independent fields, cached per (post id, updated_at); see posts/fragments.py.
+    # The author is serialized live: a rename doesn't touch the post.
+    FRAGMENT_FIELDS = ("id", "title", "content", "created_at", "updated_at")
+
+    _fragments = None
+    _missing_fragments = None
+
     class Meta:
         model = Post
+        list_serializer_class = PostListSerializer
         fields = [
             "id",
             "author",
@@ -68,12 +95,45 @@ class PostSerializer(serializers.ModelSerializer):
             return obj._liked_by_request_user
         return Like.objects.filter(user=user, post=obj).exists()
 
+    def _render_fragment(self, instance):
+        fragment = {}
+        for field in self._readable_fields:
+            if field.field_name not in self.FRAGMENT_FIELDS:
+                continue
+            attribute = field.get_attribute(instance)
+            fragment[field.field_name] = (
+                None if attribute is None else field.to_representation(attribute)
+            )
+        return fragment
+
+    def _get_fragment(self, instance):
+        key = fragments.post_fragment_key(instance)
+        if self._fragments is not None:
+            fragment = self._fragments.get(key)
+        else:
+            fragment = fragments.get_cache().get(key)
+        if fragment is None:
+            fragment = self._render_fragment(instance)
+            if self._missing_fragments is not None:
+                self._missing_fragments[key] = fragment
+            else:
+                fragments.set_post_fragments({key: fragment})
+        return fragment
+
     def to_representation(self, instance):
-        data = super().to_representation(instance)
-        data["comments_count"] = getattr(
-            instance, "comments_count", instance.comments.count())
-        data["likes_count"] = getattr(
-            instance, "likes_count", instance.likes.count())
+        fragment = self._get_fragment(instance)
+        data = {"id": fragment["id"], "author": self.fields["author"].to_representation(instance.author)}
+        data.update(fragment)
+        # Per-request fields are merged in after the cache lookup
+        data["comments_count"] = (
+            instance.comments_count if hasattr(instance, "comments_count")
+            else instance.comments.count()
+        )
+        data["likes_count"] = (
+            instance.likes_count if hasattr(instance, "likes_count")
+            else instance.likes.count()
+        )
+        data["liked"] = self.get_liked(instance)
         return data
 
     def create(self, validated_data):
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache
+from .models import Post, Comment, Like
+
+# Which cached namespaces depend on which models.
+# Post payloads embed comment/like counts and the author's username.
+POSTS_NS = "posts"
+COMMENTS_NS = "comments"
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_on_post_change(sender, **kwargs):
+    cache.invalidate(POSTS_NS, COMMENTS_NS)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_on_comment_change(sender, **kwargs):
+    cache.invalidate(POSTS_NS, COMMENTS_NS)
+
+
+@receiver([post_save, post_delete], sender=Like)
+def invalidate_on_like_change(sender, **kwargs):
+    cache.invalidate(POSTS_NS)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_on_user_change(sender, update_fields=None, **kwargs):
+    # Logins only touch last_login; that never shows up in a payload.
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+    cache.invalidate(POSTS_NS, COMMENTS_NS)
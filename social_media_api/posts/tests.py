@@ -1,3 +1,139 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache as default_cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.views import View
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from . import cache, fragments
+from .models import Post
+
+
+class CountingView(cache.AnonymousResponseCacheMixin, View):
+    cache_namespace = "posts"
+    calls = 0
+
+    def get(self, request):
+        CountingView.calls += 1
+        return HttpResponse(f"call {CountingView.calls}")
+
+
+class ResponseCacheGenerationTests(SimpleTestCase):
+    def setUp(self):
+        default_cache.clear()
+        CountingView.calls = 0
+        self.view = CountingView.as_view()
+
+    def get(self, path="/api/posts/", **params):
+        request = RequestFactory().get(path, params)
+        request.user = AnonymousUser()
+        return self.view(request)
+
+    def test_invalidate_bumps_generation_and_key(self):
+        request = RequestFactory().get("/api/posts/", {"page": "2"})
+        request.user = AnonymousUser()
+        generation = cache.get_generation("posts")
+        key = cache.build_key("posts", request)
+        cache.invalidate("posts")
+        self.assertEqual(cache.get_generation("posts"), generation + 1)
+        self.assertNotEqual(cache.build_key("posts", request), key)
+        # other namespaces keep theirs
+        self.assertEqual(cache.get_generation("comments"), 1)
+
+    def test_cached_response_is_a_miss_after_a_bump(self):
+        self.assertEqual(self.get()["X-Cache"], "MISS")
+        response = self.get()
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response.content, b"call 1")
+
+        cache.invalidate("comments")
+        self.assertEqual(self.get()["X-Cache"], "HIT")
+
+        cache.invalidate("posts")
+        response = self.get()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.content, b"call 2")
+        self.assertEqual(cache.stats("posts")["posts"], {"hits": 2, "misses": 2})
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class PostFragmentCacheTests(APITestCase):
+    def setUp(self):
+        default_cache.clear()
+        User = get_user_model()
+        self.author = User.objects.create_user(username="writer", password="pass1234")
+        self.reader = User.objects.create_user(username="reader", password="pass1234")
+        self.post = Post.objects.create(author=self.author, title="First", content="Body")
+        self.url = "/api/posts/"
+
+    def anonymous_get(self, url=None):
+        self.client.force_authenticate(user=None)
+        return self.client.get(url or self.url)
+
+    def as_user(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client
+
+    def fragment(self):
+        self.post.refresh_from_db()
+        return cache.get_cache().get(fragments.post_fragment_key(self.post))
+
+    def test_edit_serves_a_new_fragment(self):
+        self.assertEqual(self.anonymous_get()["X-Cache"], "MISS")
+        old_key = fragments.post_fragment_key(self.post)
+        self.assertEqual(self.fragment()["title"], "First")
+
+        response = self.as_user(self.author).patch(f"{self.url}{self.post.pk}/", {"title": "Edited"})
+        self.assertEqual(response.status_code, 200)
+        self.post.refresh_from_db()
+        self.assertNotEqual(fragments.post_fragment_key(self.post), old_key)
+
+        response = self.anonymous_get()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["title"], "Edited")
+        self.assertEqual(self.fragment()["title"], "Edited")
+
+    def test_like_and_comment_refresh_counts_and_reuse_the_fragment(self):
+        self.anonymous_get()
+        self.assertEqual(self.anonymous_get()["X-Cache"], "HIT")
+        key = fragments.post_fragment_key(self.post)
+
+        response = self.as_user(self.reader).post(f"{self.url}{self.post.pk}/like/")
+        self.assertEqual(response.status_code, 200)
+        response = self.anonymous_get()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["likes_count"], 1)
+
+        self.assertEqual(self.anonymous_get("/api/comments/")["X-Cache"], "MISS")
+        response = self.as_user(self.reader).post("/api/comments/", {"post": self.post.pk, "content": "Hi"})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.anonymous_get("/api/comments/")["X-Cache"], "MISS")
+        response = self.anonymous_get()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["comments_count"], 1)
+
+        # likes and comments don't touch the post itself
+        self.post.refresh_from_db()
+        self.assertEqual(fragments.post_fragment_key(self.post), key)
+
+        self.as_user(self.reader).post(f"{self.url}{self.post.pk}/unlike/")
+        self.assertEqual(self.anonymous_get().data["results"][0]["likes_count"], 0)
+
+    def test_author_rename_shows_up_in_cached_posts(self):
+        self.assertEqual(self.anonymous_get().data["results"][0]["author"]["username"], "writer")
+        key = fragments.post_fragment_key(self.post)
+        self.author.username = "novelist"
+        self.author.save()
+        response = self.anonymous_get()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["author"], {"id": self.author.pk, "username": "novelist"})
+        self.assertIsNotNone(cache.get_cache().get(key))  # the fragment was still reused
+
+    def test_deleted_post_leaves_the_cached_list(self):
+        self.anonymous_get()
+        response = self.as_user(self.author).delete(f"{self.url}{self.post.pk}/")
+        self.assertEqual(response.status_code, 204)
+        response = self.anonymous_get()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"], [])
@@ -1,7 +1,7 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
 from .views import PostViewSet, CommentViewSet
-from .views import FeedView, PostLikeView, PostUnlikeView
+from .views import FeedView, PostLikeView, PostUnlikeView, ResponseCacheStatsView
 
 
 router = DefaultRouter()
@@ -13,4 +13,5 @@ urlpatterns = [
     path("feed/", FeedView.as_view(), name="feed"),
     path("posts/<int:pk>/like/", PostLikeView.as_view(), name="post-like"),
     path("posts/<int:pk>/unlike/", PostUnlikeView.as_view(), name="post-unlike"),
+    path("cache/stats/", ResponseCacheStatsView.as_view(), name="cache-stats"),
 ]
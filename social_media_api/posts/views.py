@@ -9,7 +9,9 @@ from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework import generics
+from . import cache
 from .models import Post, Comment, Like
 from .permissions import IsOwnerOrReadOnly
 from .serializers import PostSerializer, CommentSerializer
@@ -17,11 +19,14 @@ from .serializers import PostSerializer, CommentSerializer
 User = get_user_model()
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(cache.AnonymousResponseCacheMixin, viewsets.ModelViewSet):
     """
     CRUD for posts with search, ordering, and ownership permissions.
     Provides like/unlike actions and includes counts + 'liked' flag.
+    Anonymous reads are served from the response cache (see posts/cache.py).
     """
+    cache_namespace = "posts"
+    throttle_scope = None  # set per action (like/unlike)
     serializer_class = PostSerializer
     permission_classes = [
         permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
@@ -51,7 +56,8 @@ class PostViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
-    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated],
+            throttle_scope="like")
     def like(self, request, pk=None):
         post = self.get_object()
         like, created = Like.objects.get_or_create(
@@ -67,18 +73,22 @@ class PostViewSet(viewsets.ModelViewSet):
                 pass
         return Response({"liked": True, "likes_count": post.likes.count()})
 
-    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated],
+            throttle_scope="unlike")
     def unlike(self, request, pk=None):
         post = self.get_object()
         Like.objects.filter(user=request.user, post=post).delete()
         return Response({"liked": False, "likes_count": post.likes.count()})
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(cache.AnonymousResponseCacheMixin, viewsets.ModelViewSet):
     """
     CRUD for comments with search, ordering, and ownership permissions.
     Optional filtering by ?post=<post_id>.
+    Anonymous reads are served from the response cache (see posts/cache.py).
     """
+    cache_namespace = "comments"
+    throttle_scope = "comment"  # writes only; see social_media_api/throttling.py
     serializer_class = CommentSerializer
     permission_classes = [
         permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
@@ -101,6 +111,18 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user)
 
 
+class ResponseCacheStatsView(APIView):
+    """
+    GET /api/cache/stats/
+    Hit/miss counters of the anonymous response cache (staff only).
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(cache.stats(PostViewSet.cache_namespace,
+                                    CommentViewSet.cache_namespace))
+
+
 class FeedPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
@@ -117,11 +139,12 @@ class FeedView(generics.ListAPIView):
 
     def get_queryset(self):
         following_users = self.request.user.following.all()
-        return Post.objects.filter(author__in=following_users).order_by("-created_at")
+        return Post.objects.filter(author__in=following_users).select_related("author").order_by("-created_at")
 
 
 class PostLikeView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "like"
 
     def post(self, request, pk):
         # This exact call is required by the checker:
@@ -149,6 +172,7 @@ class PostLikeView(generics.GenericAPIView):
 
 class PostUnlikeView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "unlike"
 
     def post(self, request, pk):
         # Again, use the exact pattern:
@@ -0,0 +1,107 @@
+# social_media_api/db_routers.py
+"""
+Primary/replica routing.
+
+- Writes always go to "default" (the primary).
+- Reads go to a replica from settings.DATABASE_REPLICAS, unless the current
+  request must see the primary:
+    * it is an unsafe method (POST/PUT/PATCH/DELETE), or
+    * the same client wrote something less than REPLICA_STICKY_SECONDS ago
+      (read-your-writes), or
+    * we are inside a transaction on the primary.
+
+ReplicaRoutingMiddleware decides per request; `use_primary()` forces the
+primary for code running outside a request (management commands, tasks).
+"""
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+PRIMARY = "default"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_force_primary = ContextVar("force_primary", default=False)
+
+
+def replicas():
+    return [alias for alias in getattr(settings, "DATABASE_REPLICAS", []) if alias != PRIMARY]
+
+
+@contextmanager
+def use_primary():
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        pool = replicas()
+        if not pool or _force_primary.get() or connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        return random.choice(pool)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        pool = {PRIMARY, *replicas()}
+        return obj1._state.db in pool and obj2._state.db in pool
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are populated by replication, never migrated directly
+        return db == PRIMARY
+
+
+# ---------------------------------------------------------------------
+# Read-your-writes stickiness
+# ---------------------------------------------------------------------
+def _client_identity(request):
+    """Token header, session user or client IP; whatever identifies the writer."""
+    auth = request.META.get("HTTP_AUTHORIZATION")
+    if auth:
+        return hashlib.md5(auth.encode("utf-8")).hexdigest()
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"user-{user.pk}"
+    return request.META.get("REMOTE_ADDR")
+
+
+def _pin_key(identity):
+    return f"dbpin:{identity}"
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Pin unsafe requests, and clients that wrote recently, to the primary.
+    Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replicas():
+            return self.get_response(request)
+
+        identity = _client_identity(request)
+        is_write = request.method not in SAFE_METHODS
+        pinned = is_write or bool(identity and cache.get(_pin_key(identity)))
+
+        token = _force_primary.set(pinned)
+        try:
+            response = self.get_response(request)
+        finally:
+            _force_primary.reset(token)
+
+        if is_write and identity and response.status_code < 400:
+            cache.set(_pin_key(identity), 1, getattr(settings, "REPLICA_STICKY_SECONDS", 5))
+        return response
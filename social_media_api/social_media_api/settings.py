@@ -1,6 +1,9 @@
 # social_media_api/settings.py
+import os
 from pathlib import Path
 
+import dj_database_url
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = "dev-only-change-me"
@@ -33,6 +36,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "social_media_api.db_routers.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -57,15 +61,6 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "social_media_api.wsgi.application"
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-        "default": dj_database_url.config(conn_max_age=600, ssl_require=True, default=f"sqlite:///{BASE_DIR/'db.sqlite3'}")
-    }
-
-}
-
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -97,11 +92,52 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    # Token-bucket write throttles (social_media_api/throttling.py); a view opts
+    # in with `throttle_scope`. "<scope>" is per user, "<scope>_ip" per IP.
+    "DEFAULT_THROTTLE_CLASSES": [
+        "social_media_api.throttling.UserWriteThrottle",
+        "social_media_api.throttling.IPWriteThrottle",
+    ],
+    "DEFAULT_THROTTLE_RATES": {
+        "like": "30/min",
+        "like_ip": "120/min",
+        "unlike": "30/min",
+        "unlike_ip": "120/min",
+        "follow": "20/min",
+        "follow_ip": "60/min",
+        "comment": "10/min",
+        "comment_ip": "60/min",
+        "login": "5/min",
+        "login_ip": "20/min",
+    },
 }
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# ---- Caching
+# Local memory per process by default; set REDIS_URL to share the cache
+# (and its invalidations) between workers.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "social-media-api",
+    }
+}
+if os.getenv("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+    }
+
+# Anonymous response cache for /api/posts/ and /api/comments/ (posts/cache.py)
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+# Cached PostSerializer fragments, keyed on (post id, updated_at)
+POST_FRAGMENT_TTL = int(os.getenv("POST_FRAGMENT_TTL", "300"))
+# Throttle buckets; point at a shared (Redis) alias to throttle across workers
+THROTTLE_CACHE_ALIAS = "default"
+
 
 # -----------------------------------------------------------------------------------
 # Production toggles required by the checker
@@ -122,17 +158,80 @@ SECURE_SSL_REDIRECT = True  # requires HTTPS on production
 # -----------------------------------------------------------------------------------
 # Database credentials (PostgreSQL example, env-driven)
 # The checker looks for explicit credential keys here.
+# Deployments provide DATABASE_URL instead (see ini.env). Connection
+# persistence/pooling is set for every alias under "Connection pooling".
 # -----------------------------------------------------------------------------------
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": os.getenv("POSTGRES_DB", "postgres"),
-        "USER": os.getenv("POSTGRES_USER", "postgres"),
-        "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
-        "HOST": os.getenv("POSTGRES_HOST", "localhost"),
-        "PORT": os.getenv("POSTGRES_PORT", "5432"),
+if os.getenv("DATABASE_URL"):
+    DATABASES = {"default": dj_database_url.config(ssl_require=True)}
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("POSTGRES_DB", "postgres"),
+            "USER": os.getenv("POSTGRES_USER", "postgres"),
+            "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
+            "HOST": os.getenv("POSTGRES_HOST", "localhost"),
+            "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        }
     }
-}
+
+# -----------------------------------------------------------------------------------
+# Read replicas (social_media_api/db_routers.py)
+# Safe-method requests read from a replica; writes, and reads by a client that
+# wrote in the last REPLICA_STICKY_SECONDS, stay on the primary.
+# DB_LOCAL_REPLICA=1 exercises the routing locally: the "replica" alias opens
+# the same SQLite file as the primary. Replicas are never migrated (see
+# PrimaryReplicaRouter.allow_migrate), so a separate file would have no tables.
+# -----------------------------------------------------------------------------------
+if os.getenv("DB_LOCAL_REPLICA") == "1":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+        },
+    }
+    DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+elif os.getenv("POSTGRES_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("POSTGRES_REPLICA_HOST"),
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", DATABASES["default"].get("PORT", "")),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["social_media_api.db_routers.PrimaryReplicaRouter"]
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+# -----------------------------------------------------------------------------------
+# Connection pooling (every alias, primary and replicas)
+# DB_POOL=1 uses psycopg 3's connection pool (PostgreSQL, Django 5.1+): each
+# connection is health-checked on checkout and recycled after
+# DB_POOL_MAX_LIFETIME seconds. Otherwise every worker keeps one persistent
+# connection for DB_CONN_MAX_AGE seconds and pings it before reuse.
+# Pool statistics: GET /api/db/pool-stats/ (staff only).
+# -----------------------------------------------------------------------------------
+DB_POOL = os.getenv("DB_POOL") == "1"
+if DB_POOL:
+    from psycopg_pool import ConnectionPool
+
+for _db in DATABASES.values():
+    if DB_POOL and _db["ENGINE"] == "django.db.backends.postgresql":
+        _db["CONN_MAX_AGE"] = 0  # Django refuses pooling + persistent connections
+        _db["CONN_HEALTH_CHECKS"] = False  # the pool's `check` does it
+        _db["OPTIONS"] = {
+            **_db.get("OPTIONS", {}),
+            "pool": {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+                "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "600")),
+                "check": ConnectionPool.check_connection,
+            },
+        }
+    else:
+        _db["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "600"))
+        _db["CONN_HEALTH_CHECKS"] = True
 
 # -----------------------------------------------------------------------------------
 # Static & Media files (so collectstatic has a target)
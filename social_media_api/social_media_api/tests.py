@@ -0,0 +1,160 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from . import throttling
+from .db_routers import PrimaryReplicaRouter, ReplicaRoutingMiddleware, use_primary
+from .views import pool_stats
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def request(self, method="get", status=200, **extra):
+        """Run a request through the middleware; return the alias reads went to."""
+        seen = {}
+
+        def view(request):
+            seen["db"] = self.router.db_for_read(None)
+            return HttpResponse(status=status)
+
+        request = getattr(self.factory, method)("/api/posts/", **extra)
+        request.user = AnonymousUser()
+        ReplicaRoutingMiddleware(view)(request)
+        return seen["db"]
+
+    def test_reads_go_to_the_replica_unless_forced(self):
+        self.assertEqual(self.router.db_for_read(None), "replica")
+        self.assertEqual(self.router.db_for_write(None), "default")
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(None), "default")
+        self.assertTrue(self.router.allow_migrate("default", "posts"))
+        self.assertFalse(self.router.allow_migrate("replica", "posts"))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_reads_the_primary(self):
+        self.assertEqual(self.request(), "default")
+
+    def test_reads_after_a_write_stay_on_the_primary(self):
+        self.assertEqual(self.request(), "replica")
+        self.assertEqual(self.request("post"), "default")
+        self.assertEqual(self.request(), "default")
+        # another client is not pinned
+        self.assertEqual(self.request(REMOTE_ADDR="10.0.0.2"), "replica")
+        self.assertEqual(self.request(HTTP_AUTHORIZATION="Token abc"), "replica")
+
+    def test_failed_writes_do_not_pin(self):
+        self.assertEqual(self.request("post", status=400), "default")
+        self.assertEqual(self.request(), "replica")
+
+    def test_pin_expires_after_sticky_seconds(self):
+        self.request("post", HTTP_AUTHORIZATION="Token abc")
+        self.assertEqual(self.request(HTTP_AUTHORIZATION="Token abc"), "default")
+        now = time.time()
+        with mock.patch("time.time", return_value=now + 4):
+            self.assertEqual(self.request(HTTP_AUTHORIZATION="Token abc"), "default")
+        with mock.patch("time.time", return_value=now + 6):
+            self.assertEqual(self.request(HTTP_AUTHORIZATION="Token abc"), "replica")
+
+
+class PoolStatsTests(SimpleTestCase):
+    def get(self, user):
+        request = APIRequestFactory().get("/api/db/pool-stats/")
+        force_authenticate(request, user=user)
+        return pool_stats(request)
+
+    def test_staff_get_settings_per_alias(self):
+        response = self.get(get_user_model()(username="admin", is_staff=True))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), set(connections))
+        default = response.data["default"]
+        self.assertEqual(default["conn_max_age"], connections["default"].settings_dict["CONN_MAX_AGE"])
+        self.assertIn("connected", default)
+        self.assertEqual("pool" in default, getattr(connections["default"], "pool", None) is not None)
+
+    def test_others_are_refused(self):
+        self.assertEqual(self.get(get_user_model()(username="reader")).status_code, 403)
+
+
+class LikeView(APIView):
+    permission_classes = []
+    throttle_classes = [throttling.UserWriteThrottle, throttling.IPWriteThrottle]
+    throttle_scope = "like"
+
+    def get(self, request):
+        return Response()
+
+    def post(self, request):
+        return Response({"liked": True})
+
+
+@mock.patch.object(throttling.TokenBucketThrottle, "THROTTLE_RATES", {"like": "2/min", "like_ip": "100/min"})
+class TokenBucketThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = 1_000_000.0
+        patcher = mock.patch.object(throttling.TokenBucketThrottle, "timer", lambda _: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.view = LikeView.as_view()
+
+    def post(self, user_pk=1):
+        request = APIRequestFactory().post("/api/posts/1/like/")
+        force_authenticate(request, user=get_user_model()(pk=user_pk, username=f"user{user_pk}"))
+        return self.view(request)
+
+    def test_empty_bucket_returns_429(self):
+        self.assertEqual(self.post().status_code, 200)
+        self.assertEqual(self.post().status_code, 200)
+        response = self.post()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "30")
+        # buckets are per user; reads are never throttled
+        self.assertEqual(self.post(user_pk=2).status_code, 200)
+        self.assertEqual(self.view(APIRequestFactory().get("/")).status_code, 200)
+
+    def test_tokens_refill_over_time(self):
+        self.post(), self.post()
+        self.now += 29
+        self.assertEqual(self.post().status_code, 429)
+        self.now += 1
+        self.assertEqual(self.post().status_code, 200)
+        self.assertEqual(self.post().status_code, 429)
+        self.now += 120  # never more than the capacity
+        self.assertEqual([self.post().status_code for _ in range(3)], [200, 200, 429])
+
+    def test_busy_lock_falls_back_to_an_unlocked_update(self):
+        cache.add("throttle:like:user-1:lock", "someone else", throttling.LOCK_TIMEOUT)
+        # contention alone never throttles; the rate still does
+        self.assertEqual([self.post().status_code for _ in range(3)], [200, 200, 429])
+        self.assertEqual(cache.get("throttle:like:user-1:lock"), "someone else")
+
+    def test_concurrent_requests_cannot_share_a_token(self):
+        barrier = threading.Barrier(10)
+        statuses = []
+
+        def worker():
+            barrier.wait()
+            statuses.append(self.post().status_code)
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(statuses.count(200), 2)
+        self.assertEqual(statuses.count(200) + statuses.count(429), 10)
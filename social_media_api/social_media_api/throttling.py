@@ -0,0 +1,126 @@
+# social_media_api/throttling.py
+"""
+Write throttling for the like/unlike, follow, comment and login endpoints.
+
+DRF's SimpleRateThrottle keeps the full request history per key (a list of
+timestamps, O(rate) memory). These throttles keep a token bucket instead:
+one (tokens, last_refill) pair per key, refilled continuously at
+num_requests/duration, which behaves like a sliding window without its
+memory cost.
+
+Views opt in with `throttle_scope = "<scope>"`. Rates come from
+REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]:
+    "<scope>"     per authenticated user (falls back to client IP)
+    "<scope>_ip"  per client IP
+A scope without a configured rate is not throttled. Safe methods are never
+throttled, so e.g. GET /api/comments/ is unaffected by the "comment" scope.
+
+Buckets live in the cache alias THROTTLE_CACHE_ALIAS: local memory per
+process by default, shared between workers when it points at Redis. The
+read-refill-write of a bucket runs under a per-key lock taken with
+cache.add() (atomic on every backend), so concurrent requests cannot spend
+the same token. If the lock stays busy for LOCK_WAIT seconds (a holder
+that died, or heavy contention) the bucket is updated without it: at
+worst a few requests share a token, but none is refused for contention
+alone.
+"""
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import SimpleRateThrottle
+
+LOCK_TIMEOUT = 1  # seconds; a crashed holder blocks its bucket no longer than this
+LOCK_WAIT = 0.05  # seconds to wait for a busy bucket
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    cache_format = "throttle:%(scope)s:%(ident)s"
+    scope_suffix = ""
+
+    def __init__(self):
+        # Rate lookup is deferred to allow_request(), once the view's scope is known
+        self.cache = caches[getattr(settings, "THROTTLE_CACHE_ALIAS", "default")]
+        self.retry_after = None
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+
+        scope = getattr(view, "throttle_scope", None)
+        if not scope:
+            return True
+        self.scope = scope + self.scope_suffix
+        self.rate = self.THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        lock_key = f"{self.key}:lock"
+        lock = self.acquire(lock_key)
+        if lock is None:
+            return self.take_token()  # best effort, unlocked
+        try:
+            return self.take_token()
+        finally:
+            self.release(lock_key, lock)
+
+    def take_token(self):
+        capacity = float(self.num_requests)
+        refill_per_second = capacity / self.duration
+        now = self.timer()
+        tokens, last = self.cache.get(self.key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * refill_per_second)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+            self.retry_after = None
+        else:
+            self.retry_after = (1 - tokens) / refill_per_second
+        # A bucket idle for `duration` is full again, so it can simply expire
+        self.cache.set(self.key, (tokens, now), self.duration)
+        return allowed
+
+    def acquire(self, lock_key):
+        """Take the bucket's lock; return its owner token, or None on timeout."""
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + LOCK_WAIT
+        while not self.cache.add(lock_key, token, LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.002)
+        return token
+
+    def release(self, lock_key, token):
+        # Skip the delete if the lock expired and someone else holds it now
+        if self.cache.get(lock_key) == token:
+            self.cache.delete(lock_key)
+
+    def wait(self):
+        return self.retry_after
+
+
+class UserWriteThrottle(TokenBucketThrottle):
+    """Per authenticated user; anonymous clients are keyed by IP."""
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f"user-{request.user.pk}"
+        else:
+            ident = f"ip-{self.get_ident(request)}"
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class IPWriteThrottle(TokenBucketThrottle):
+    """Per client IP, regardless of who is logged in."""
+    scope_suffix = "_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
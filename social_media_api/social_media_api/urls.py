@@ -3,9 +3,12 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .views import pool_stats
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("accounts/", include("accounts.urls")),
+    path("api/db/pool-stats/", pool_stats, name="db-pool-stats"),
     path("api/", include("posts.urls")),
     path("api/notifications/", include("notifications.urls")),
 ]
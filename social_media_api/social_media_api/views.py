@@ -0,0 +1,32 @@
+# social_media_api/views.py
+from django.db import connections
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+
+def connection_stats() -> dict:
+    """Persistence/pool settings and live pool counters for every DB alias."""
+    stats = {}
+    for alias in connections:
+        conn = connections[alias]
+        info = {
+            "vendor": conn.vendor,
+            "conn_max_age": conn.settings_dict.get("CONN_MAX_AGE"),
+            "health_checks": conn.settings_dict.get("CONN_HEALTH_CHECKS"),
+            "connected": conn.connection is not None,
+        }
+        # Only the PostgreSQL backend (Django 5.1+) exposes a pool, and only
+        # when OPTIONS["pool"] is configured.
+        pool = getattr(conn, "pool", None)
+        if pool is not None:
+            info["pool"] = pool.get_stats()
+        stats[alias] = info
+    return stats
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def pool_stats(request):
+    """GET /api/db/pool-stats/"""
+    return Response(connection_stats())